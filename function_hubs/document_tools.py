@@ -4,10 +4,12 @@ Document Processing Tools for OxyGent Framework
 
 """
 
-import json
+import functools
 import logging
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
+
+import orjson
 from pydantic import Field
 
 from oxygent.oxy import FunctionHub
@@ -16,6 +18,14 @@ from oxygent.oxy import FunctionHub
 logger = logging.getLogger(__name__)
 
 
+def _to_json(data: Dict[str, Any], pretty: bool = False) -> str:
+    """将工具结果序列化为JSON字符串（orjson默认输出UTF-8，不转义中文）"""
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, option=option).decode()
+
+
 class DocumentToolsHub(FunctionHub):
     """文档处理工具中心，管理所有文档相关操作"""
 
@@ -70,6 +80,7 @@ def extract_pdf_text(
     path: str,
     page_range: Optional[str] = None,
     max_chars_per_page: int = 10000,
+    output_path: Optional[str] = None,
 ) -> str:
     """
     提取PDF文本内容
@@ -78,11 +89,13 @@ def extract_pdf_text(
     - 使用PyMuPDF (fitz)进行高效文本提取
     - 支持多种PDF编码格式
     - 自动处理页面旋转和布局
+    - 指定output_path时逐页写入NDJSON文件，内存占用不随页数增长
     
     Args:
         path: PDF文件路径
         page_range: 页码范围字符串
         max_chars_per_page: 单页最大字符数
+        output_path: 可选，逐页写入的NDJSON文件路径；指定后返回结果不含pages
         
     Returns:
         JSON格式的提取结果，包含文本内容和元数据
@@ -91,61 +104,45 @@ def extract_pdf_text(
         import fitz
         
         if not Path(path).exists():
-            return json.dumps(
-                {"error": f"文件不存在: {path}"}, 
-                ensure_ascii=False
-            )
-        
-        doc = fitz.open(path)
-        total_pages = len(doc)
-        
-        # 解析页码范围
-        pages = _parse_page_range(page_range, total_pages)
+            return _to_json({"error": f"文件不存在: {path}"})
         
-        if not pages:
-            return json.dumps(
-                {"error": "无效的页码范围或页码超出文档范围"},
-                ensure_ascii=False
-            )
-        
-        # 提取文本
-        results = []
-        for page_num in pages:
-            page = doc[page_num]
-            text = page.get_text("text")  # 使用纯文本模式
+        with fitz.open(path) as doc:
+            total_pages = len(doc)
             
-            # 限制单页文本长度
-            if len(text) > max_chars_per_page:
-                text = text[:max_chars_per_page] + f"\n...(已截断，原文本长度: {len(text)}字符)"
+            # 解析页码范围
+            pages = _parse_page_range(page_range, total_pages)
             
-            results.append({
-                "page_number": page_num + 1,
-                "text": text.strip(),
-                "char_count": len(text),
-                "has_images": len(page.get_images()) > 0
-            })
-        
-        doc.close()
-        
-        return json.dumps({
-            "success": True,
-            "file_path": path,
-            "total_pages": total_pages,
-            "extracted_pages": len(pages),
-            "pages": results
-        }, ensure_ascii=False, indent=2)
+            if not pages:
+                return _to_json({"error": "无效的页码范围或页码超出文档范围"})
+            
+            page_records = _iter_pdf_text_pages(doc, pages, max_chars_per_page)
+            
+            # 流式写出，避免在内存中累积全部页面
+            if output_path:
+                with open(output_path, "wb") as f:
+                    for record in page_records:
+                        f.write(orjson.dumps(record) + b"\n")
+                return _to_json({
+                    "success": True,
+                    "file_path": path,
+                    "total_pages": total_pages,
+                    "extracted_pages": len(pages),
+                    "output_path": output_path
+                }, pretty=True)
+            
+            return _to_json({
+                "success": True,
+                "file_path": path,
+                "total_pages": total_pages,
+                "extracted_pages": len(pages),
+                "pages": list(page_records)
+            }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"})
     except Exception as e:
         logger.error(f"PDF文本提取失败: {e}")
-        return json.dumps(
-            {"error": f"提取失败: {str(e)}"}, 
-            ensure_ascii=False
-        )
+        return _to_json({"error": f"提取失败: {str(e)}"})
 
 
 # ==================== PDF 表格提取 ====================
@@ -181,7 +178,7 @@ def extract_pdf_tables(
         import pdfplumber
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         all_tables = []
         
@@ -219,21 +216,18 @@ def extract_pdf_tables(
                         "column_count": len(headers) if headers else 0
                     })
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "table_count": len(all_tables),
             "tables": all_tables
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "pdfplumber未安装，请运行: pip install pdfplumber"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "pdfplumber未安装，请运行: pip install pdfplumber"})
     except Exception as e:
         logger.error(f"PDF表格提取失败: {e}")
-        return json.dumps({"error": f"提取失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"提取失败: {str(e)}"})
 
 
 # ==================== PDF 图像提取 ====================
@@ -271,7 +265,7 @@ def extract_pdf_images(
         import fitz
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         # 创建输出目录
         output_path = Path(output_dir)
@@ -323,22 +317,19 @@ def extract_pdf_images(
         
         doc.close()
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "output_dir": str(output_path),
             "image_count": len(image_list),
             "images": image_list
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"})
     except Exception as e:
         logger.error(f"PDF图像提取失败: {e}")
-        return json.dumps({"error": f"提取失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"提取失败: {str(e)}"})
 
 
 # ==================== PDF 合并 ====================
@@ -380,14 +371,14 @@ def merge_pdfs(
                 missing_files.append(pdf_path)
         
         if missing_files:
-            return json.dumps({
+            return _to_json({
                 "error": f"以下文件不存在: {', '.join(missing_files)}"
-            }, ensure_ascii=False)
+            })
         
         if len(pdf_paths) < 2:
-            return json.dumps({
+            return _to_json({
                 "error": "至少需要2个PDF文件才能合并"
-            }, ensure_ascii=False)
+            })
         
         # 创建新文档
         merged_doc = fitz.open()
@@ -408,30 +399,27 @@ def merge_pdfs(
             except Exception as e:
                 logger.error(f"合并文件 {pdf_path} 失败: {e}")
                 merged_doc.close()
-                return json.dumps({
+                return _to_json({
                     "error": f"合并文件 {pdf_path} 时出错: {str(e)}"
-                }, ensure_ascii=False)
+                })
         
         # 保存合并后的文档
         merged_doc.save(output_path)
         merged_doc.close()
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "message": f"成功合并 {len(pdf_paths)} 个PDF文件",
             "output_path": output_path,
             "total_pages": total_pages,
             "source_files": pdf_paths
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"})
     except Exception as e:
         logger.error(f"PDF合并失败: {e}")
-        return json.dumps({"error": f"合并失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"合并失败: {str(e)}"})
 
 
 # ==================== PDF 拆分 ====================
@@ -469,7 +457,7 @@ def split_pdf(
         import fitz
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         # 创建输出目录
         output_path = Path(output_dir)
@@ -491,8 +479,9 @@ def split_pdf(
                 # 创建新文档
                 new_doc = fitz.open()
                 
-                for page_num in pages:
-                    new_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+                # 连续页码合并为一次插入，减少insert_pdf调用次数
+                for from_page, to_page in _contiguous_page_runs(pages):
+                    new_doc.insert_pdf(doc, from_page=from_page, to_page=to_page)
                 
                 # 保存文件
                 output_filename = f"{name_prefix}_{idx + 1}.pdf"
@@ -514,26 +503,23 @@ def split_pdf(
         doc.close()
         
         if not output_files:
-            return json.dumps({
+            return _to_json({
                 "error": "没有成功拆分任何文件，请检查页码范围是否正确"
-            }, ensure_ascii=False)
+            })
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "message": f"成功拆分为 {len(output_files)} 个文件",
             "source_file": path,
             "output_dir": str(output_path),
             "files": output_files
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"})
     except Exception as e:
         logger.error(f"PDF拆分失败: {e}")
-        return json.dumps({"error": f"拆分失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"拆分失败: {str(e)}"})
 
 
 # ==================== PDF 元数据获取 ====================
@@ -564,10 +550,25 @@ def get_pdf_info(
         import fitz
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
-        doc = fitz.open(path)
+        # 以修改时间和大小作为缓存键，文件变化后自动失效
+        stat = Path(path).stat()
+        return _pdf_info_json(str(path), stat.st_mtime_ns, stat.st_size)
         
+    except ImportError:
+        return _to_json({"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"})
+    except Exception as e:
+        logger.error(f"获取PDF信息失败: {e}")
+        return _to_json({"error": f"获取信息失败: {str(e)}"})
+
+
+@functools.lru_cache(maxsize=64)
+def _pdf_info_json(path: str, mtime_ns: int, file_size: int) -> str:
+    """计算PDF信息JSON；同一文件版本的重复查询直接命中缓存，无需重新遍历全部页面"""
+    import fitz
+    
+    with fitz.open(path) as doc:
         # 获取元数据
         metadata = doc.metadata
         
@@ -589,7 +590,6 @@ def get_pdf_info(
         
         # 文件信息
         file_path = Path(path)
-        file_size = file_path.stat().st_size
         
         info = {
             "success": True,
@@ -625,19 +625,8 @@ def get_pdf_info(
             },
             "page_sizes": page_sizes[:5] if len(page_sizes) > 5 else page_sizes  # 只返回前5页尺寸
         }
-        
-        doc.close()
-        
-        return json.dumps(info, ensure_ascii=False, indent=2)
-        
-    except ImportError:
-        return json.dumps(
-            {"error": "PyMuPDF未安装，请运行: pip install PyMuPDF"},
-            ensure_ascii=False
-        )
-    except Exception as e:
-        logger.error(f"获取PDF信息失败: {e}")
-        return json.dumps({"error": f"获取信息失败: {str(e)}"}, ensure_ascii=False)
+    
+    return _to_json(info, pretty=True)
 
 
 # ==================== Word 文档操作 ====================
@@ -673,7 +662,7 @@ def read_docx(
         from docx import Document
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         doc = Document(path)
         
@@ -713,7 +702,7 @@ def read_docx(
         total_text = " ".join(p["text"] for p in paragraphs)
         word_count = len(total_text.split())
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "statistics": {
@@ -724,16 +713,13 @@ def read_docx(
             },
             "paragraphs": paragraphs,
             "tables": tables_data
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "python-docx未安装，请运行: pip install python-docx"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "python-docx未安装，请运行: pip install python-docx"})
     except Exception as e:
         logger.error(f"读取Word文档失败: {e}")
-        return json.dumps({"error": f"读取失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"读取失败: {str(e)}"})
 
 
 @document_tools.tool(
@@ -758,7 +744,7 @@ def extract_docx_text(
         from docx import Document
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         doc = Document(path)
         
@@ -778,22 +764,19 @@ def extract_docx_text(
         
         result_text = "\n".join(full_text)
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "text": result_text,
             "length": len(result_text),
             "line_count": len(full_text)
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
-            {"error": "python-docx未安装，请运行: pip install python-docx"},
-            ensure_ascii=False
-        )
+        return _to_json({"error": "python-docx未安装，请运行: pip install python-docx"})
     except Exception as e:
         logger.error(f"提取Word文本失败: {e}")
-        return json.dumps({"error": f"提取失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"提取失败: {str(e)}"})
 
 
 # ==================== Excel 文档操作 ====================
@@ -831,17 +814,17 @@ def read_excel(
         from openpyxl import load_workbook
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         wb = load_workbook(path, read_only=True, data_only=True)
         
         # 获取工作表
         if sheet_name:
             if sheet_name not in wb.sheetnames:
-                return json.dumps({
+                return _to_json({
                     "error": f"工作表 '{sheet_name}' 不存在",
                     "available_sheets": wb.sheetnames
-                }, ensure_ascii=False)
+                })
             ws = wb[sheet_name]
         else:
             ws = wb.active
@@ -862,15 +845,15 @@ def read_excel(
         wb.close()
         
         if not data:
-            return json.dumps({
+            return _to_json({
                 "error": "工作表为空或没有数据"
-            }, ensure_ascii=False)
+            })
         
         # 分离表头和数据
         headers = data[0] if has_header and data else []
         rows = data[1:] if has_header and len(data) > 1 else data
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "sheet_name": ws.title,
@@ -882,10 +865,10 @@ def read_excel(
             },
             "headers": headers,
             "rows": rows
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
+        return _to_json(
             {
                 "error": "您需要先安装openpyxl包才能读取该Excel文件。",
                 "solution": "请运行以下命令安装：",
@@ -894,12 +877,11 @@ def read_excel(
                     "pip": "pip install openpyxl"
                 },
                 "note": "或者安装所有依赖: pip install -r requirements.txt 或 uv pip install -r requirements.txt"
-            },
-            ensure_ascii=False
+            }
         )
     except Exception as e:
         logger.error(f"读取Excel失败: {e}")
-        return json.dumps({"error": f"读取失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"读取失败: {str(e)}"})
 
 
 @document_tools.tool(
@@ -927,7 +909,7 @@ def list_excel_sheets(
         from openpyxl import load_workbook
         
         if not Path(path).exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         wb = load_workbook(path, read_only=True)
         
@@ -950,15 +932,15 @@ def list_excel_sheets(
         
         wb.close()
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "sheet_count": len(sheets_info),
             "sheets": sheets_info
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except ImportError:
-        return json.dumps(
+        return _to_json(
             {
                 "error": "您需要先安装openpyxl包才能读取该Excel文件。",
                 "solution": "请运行以下命令安装：",
@@ -967,16 +949,44 @@ def list_excel_sheets(
                     "pip": "pip install openpyxl"
                 },
                 "note": "或者安装所有依赖: pip install -r requirements.txt 或 uv pip install -r requirements.txt"
-            },
-            ensure_ascii=False
+            }
         )
     except Exception as e:
         logger.error(f"列出工作表失败: {e}")
-        return json.dumps({"error": f"操作失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"操作失败: {str(e)}"})
 
 
 # ==================== 辅助工具函数 ====================
 
+def _contiguous_page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """将有序页码列表合并为连续区间，如 [0, 1, 2, 5] -> [(0, 2), (5, 5)]"""
+    runs = []
+    for page_num in pages:
+        if runs and page_num == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page_num)
+        else:
+            runs.append((page_num, page_num))
+    return runs
+
+
+def _iter_pdf_text_pages(doc, pages: List[int], max_chars_per_page: int):
+    """逐页提取PDF文本，每次只持有一页的内容"""
+    for page_num in pages:
+        page = doc[page_num]
+        text = page.get_text("text")  # 使用纯文本模式
+        
+        # 限制单页文本长度
+        if len(text) > max_chars_per_page:
+            text = text[:max_chars_per_page] + f"\n...(已截断，原文本长度: {len(text)}字符)"
+        
+        yield {
+            "page_number": page_num + 1,
+            "text": text.strip(),
+            "char_count": len(text),
+            "has_images": len(page.get_images()) > 0
+        }
+
+
 def _parse_page_range(range_str: Optional[str], total_pages: int) -> List[int]:
     """
     解析页码范围字符串
@@ -1010,10 +1020,8 @@ def _parse_page_range(range_str: Optional[str], total_pages: int) -> List[int]:
                 start_page = int(start.strip())
                 end_page = int(end.strip())
                 
-                # 转换为0索引，并验证范围
-                for p in range(start_page - 1, end_page):
-                    if 0 <= p < total_pages:
-                        pages.add(p)
+                # 转换为0索引，先裁剪到文档范围再批量加入
+                pages.update(range(max(start_page - 1, 0), min(end_page, total_pages)))
             else:
                 # 单页格式：3
                 page_num = int(part)
@@ -1025,7 +1033,7 @@ def _parse_page_range(range_str: Optional[str], total_pages: int) -> List[int]:
         logger.error(f"解析页码范围失败: {range_str}, 错误: {e}")
         return []
     
-    return sorted(list(pages))
+    return sorted(pages)
 
 
 @document_tools.tool(
@@ -1054,7 +1062,7 @@ def detect_document_format(
         file_path = Path(path)
         
         if not file_path.exists():
-            return json.dumps({"error": f"文件不存在: {path}"}, ensure_ascii=False)
+            return _to_json({"error": f"文件不存在: {path}"})
         
         extension = file_path.suffix.lower()
         
@@ -1126,7 +1134,7 @@ def detect_document_format(
         # 添加文件基本信息
         file_size = file_path.stat().st_size
         
-        return json.dumps({
+        return _to_json({
             "success": True,
             "file_path": path,
             "filename": file_path.name,
@@ -1134,9 +1142,9 @@ def detect_document_format(
             "size_bytes": file_size,
             "size_mb": round(file_size / (1024 * 1024), 2),
             "format_info": info
-        }, ensure_ascii=False, indent=2)
+        }, pretty=True)
         
     except Exception as e:
         logger.error(f"检测文档格式失败: {e}")
-        return json.dumps({"error": f"检测失败: {str(e)}"}, ensure_ascii=False)
+        return _to_json({"error": f"检测失败: {str(e)}"})
 
@@ -5,6 +5,8 @@ import logging
 import os
 import re
 
+logger = logging.getLogger(__name__)
+
 
 def deep_update(d, u):
     for k, v in u.items():
@@ -92,6 +94,7 @@ class Config:
             "auto_open_webpage": True,
             "log_level": "INFO",
             "workers": 1,
+            "upload_buffer_size": 1048576,  # 1MB
         },
         "agent": {
             "prompt": "",
@@ -520,6 +523,32 @@ class Config:
     def get_server_auto_open_webpage(cls):
         return cls.get_module_config("server", "auto_open_webpage")
 
+    @staticmethod
+    def _is_valid_buffer_size(size):
+        return isinstance(size, int) and not isinstance(size, bool) and size > 0
+
+    @classmethod
+    def set_server_upload_buffer_size(cls, upload_buffer_size=1048576):
+        if not cls._is_valid_buffer_size(upload_buffer_size):
+            raise ValueError(
+                f"upload_buffer_size must be a positive integer, got {upload_buffer_size!r}"
+            )
+        cls.set_module_config("server", "upload_buffer_size", upload_buffer_size)
+
+    @classmethod
+    def get_server_upload_buffer_size(cls):
+        upload_buffer_size = cls.get_module_config(
+            "server", "upload_buffer_size", 1048576
+        )
+        # A zero or negative size would make the upload read loop misbehave,
+        # so a bad value from config.json falls back to the default
+        if not cls._is_valid_buffer_size(upload_buffer_size):
+            logger.warning(
+                f"Invalid server.upload_buffer_size {upload_buffer_size!r}, using 1048576"
+            )
+            return 1048576
+        return upload_buffer_size
+
     @classmethod
     def set_server_on_latest_webpage(cls, on_latest_webpage=True):
         cls.set_module_config("server", "on_latest_webpage", on_latest_webpage)
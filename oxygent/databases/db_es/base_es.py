@@ -57,12 +57,14 @@ class BaseEs(BaseDB, ABC):
         pass
 
     @abstractmethod
-    async def search(self, index_name, body):
+    async def search(self, index_name, body, preference=None):
         """Execute a search query against an Elasticsearch index.
 
         Args:
             index_name: Name of the index to search
             body: Search query body containing filters, aggregations, etc.
+            preference: Optional ES search preference; requests sharing a
+                preference are served by the same shard copies
 
         Returns:
             Search results matching the query criteria
@@ -72,6 +74,26 @@ class BaseEs(BaseDB, ABC):
         """
         pass
 
+    async def msearch(self, index_name, bodies, preference=None):
+        """Execute several search queries against an index in one request.
+
+        The default implementation runs the searches one after another;
+        subclasses backed by a real cluster override it with a single
+        multi-search round trip.
+
+        Args:
+            index_name: Name of the index to search
+            bodies: List of search query bodies
+            preference: Optional ES search preference applied to every search
+
+        Returns:
+            List of search results, in the same order as ``bodies``
+        """
+        return [
+            await self.search(index_name, body, preference=preference)
+            for body in bodies
+        ]
+
     @abstractmethod
     async def exists(self, index_name, doc_id):
         """Check if a document exists in the specified index.
@@ -2,18 +2,57 @@ import asyncio
 import logging
 import os
 
+import orjson
 from elasticsearch import Elasticsearch
+from elasticsearch.exceptions import SerializationError
+from elasticsearch.serializer import JSONSerializer
 
 from .base_es import BaseEs
 
 logger = logging.getLogger(__name__)
 
 
+class OrjsonSerializer(JSONSerializer):
+    """JSON serializer for the ES client backed by orjson.
+
+    Values orjson cannot encode natively go through the stock ``default``
+    hook; anything orjson rejects outright (e.g. integers wider than 64 bits)
+    falls back to the stdlib-based serializer.
+    """
+
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def loads(self, s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as e:
+            raise SerializationError(s, e)
+
+    def dumps(self, data):
+        # don't serialize strings
+        if isinstance(data, str):
+            return data
+
+        try:
+            return orjson.dumps(
+                data, default=self.default, option=self._OPTIONS
+            ).decode()
+        except TypeError:
+            return super().dumps(data)
+
+
 class JesEs(BaseEs):
-    def __init__(self, hosts, user, password, maxsize=200, timeout=60):
+    def __init__(
+        self, hosts, user, password, maxsize=200, timeout=60, http_compress=True
+    ):
         try:
             self.client = Elasticsearch(
-                hosts, http_auth=(user, password), maxsize=maxsize, timeout=timeout
+                hosts,
+                http_auth=(user, password),
+                maxsize=maxsize,
+                timeout=timeout,
+                http_compress=http_compress,
+                serializer=OrjsonSerializer(),
             )
         except Exception as e:
             logger.error(e)
@@ -87,8 +126,34 @@ class JesEs(BaseEs):
             self.client.update, index=index_name, id=doc_id, body={"doc": body}
         )
 
-    async def search(self, index_name, body):
-        return await self._run_sync(self.client.search, index=index_name, body=body)
+    async def search(self, index_name, body, preference=None):
+        if preference is None:
+            return await self._run_sync(
+                self.client.search, index=index_name, body=body
+            )
+        return await self._run_sync(
+            self.client.search, index=index_name, body=body, preference=preference
+        )
+
+    async def msearch(self, index_name, bodies, preference=None):
+        header = {} if preference is None else {"preference": preference}
+        searches = []
+        for body in bodies:
+            searches.extend([header, body])
+        response = await self._run_sync(
+            self.client.msearch, index=index_name, body=searches
+        )
+        # ES answers 200 even when single searches fail; those items carry an
+        # "error" instead of "hits", so fail the whole batch like a failed search
+        responses = response["responses"]
+        for i, item in enumerate(responses):
+            if "error" in item:
+                logger.error(
+                    f"msearch on {index_name} failed for search {i}: "
+                    f"status={item.get('status')} error={item['error']}"
+                )
+                return None
+        return responses
 
     async def exists(self, index_name, doc_id):
         return await self._run_sync(self.client.exists, index=index_name, id=doc_id)
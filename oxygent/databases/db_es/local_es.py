@@ -173,17 +173,48 @@ class LocalEs(BaseEs):
         data = await self._read_json_safe(self._index_path(index_name)) or {}
         return doc_id in data
 
-    async def search(self, index_name: str, body: dict[str, Any]):
+    async def search(
+        self, index_name: str, body: dict[str, Any], preference: Optional[str] = None
+    ):
+        # preference only matters for clusters with several shard copies
         data = await self._read_json_safe(self._index_path(index_name)) or {}
-        docs = self._build_docs(data)
-        docs = self._filter_docs(docs, body.get("query", {}))
-        docs = self._sort_docs(docs, body.get("sort", []))
-        return {"hits": {"hits": docs[: body.get("size", 10)]}}
+        return self._run_query(data, body)
+
+    async def msearch(
+        self,
+        index_name: str,
+        bodies: list[dict[str, Any]],
+        preference: Optional[str] = None,
+    ):
+        # Load the index file once and run every query against it
+        data = await self._read_json_safe(self._index_path(index_name)) or {}
+        return [self._run_query(data, body) for body in bodies]
 
     # ------------------------------------------------------------------
     # Helpers for naive query execution
     # ------------------------------------------------------------------
 
+    def _run_query(self, data: dict[str, Any], body: dict[str, Any]):
+        docs = self._build_docs(data)
+        docs = self._filter_docs(docs, body.get("query", {}))
+        sort_spec = body.get("sort", [])
+        if sort_spec:
+            docs = self._sort_docs(docs, sort_spec)
+            fields = [field for s in sort_spec for field in s]
+            for d in docs:
+                d["sort"] = [d["_source"].get(field) for field in fields]
+            if "search_after" in body:
+                docs = self._search_after(docs, body["search_after"])
+        return {"hits": {"hits": docs[: body.get("size", 10)]}}
+
+    @staticmethod
+    def _search_after(docs: list[dict[str, Any]], search_after: list[Any]):
+        # Docs are already sorted, so resume right after the given sort values
+        for i, d in enumerate(docs):
+            if d["sort"] == search_after:
+                return docs[i + 1 :]
+        return []
+
     @staticmethod
     def _build_docs(data: dict[str, Any]):
         return [{"_id": k, "_source": v} for k, v in data.items()]
@@ -196,17 +227,22 @@ class LocalEs(BaseEs):
             k, v = next(iter(query["term"].items()))
             if k == "_id":
                 return [d for d in docs if d["_id"] == v]
-            return [d for d in docs if d["_source"].get(k) == v]
+            return [d for d in docs if self._term_matches(d["_source"].get(k), v)]
 
         if "terms" in query:
             k, vlist = next(iter(query["terms"].items()))
-            return [d for d in docs if d["_source"].get(k) in vlist]
+            return [
+                d for d in docs if self._terms_match(d["_source"].get(k), vlist)
+            ]
 
         if "bool" in query:
             bool_query = query["bool"]
 
-            if "must" in bool_query:
-                must_conditions = bool_query["must"]
+            if "must" in bool_query or "filter" in bool_query:
+                # Without scoring, filter clauses match exactly like must clauses
+                must_conditions = bool_query.get("must", []) + bool_query.get(
+                    "filter", []
+                )
                 filtered_docs = docs.copy()
 
                 for condition in must_conditions:
@@ -271,14 +307,27 @@ class LocalEs(BaseEs):
             k, v = next(iter(condition["term"].items()))
             if k == "_id":
                 return doc["_id"] == v
-            return doc["_source"].get(k) == v
+            return self._term_matches(doc["_source"].get(k), v)
 
         if "terms" in condition:
             k, vlist = next(iter(condition["terms"].items()))
-            return doc["_source"].get(k) in vlist
+            return self._terms_match(doc["_source"].get(k), vlist)
 
         return False
 
+    @staticmethod
+    def _term_matches(value: Any, term: Any) -> bool:
+        # Like ES, a term matches an array field if any element equals it
+        if isinstance(value, list):
+            return term in value
+        return value == term
+
+    @staticmethod
+    def _terms_match(value: Any, terms: list[Any]) -> bool:
+        if isinstance(value, list):
+            return any(v in terms for v in value)
+        return value in terms
+
     @staticmethod
     def _sort_docs(docs: list[dict[str, Any]], spec: list[dict[str, Any]]):
         for s in reversed(spec):
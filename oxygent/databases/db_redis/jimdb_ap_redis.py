@@ -8,7 +8,6 @@ operations with size limits and expiration management.
 import asyncio
 import json
 import logging
-import traceback
 from functools import wraps
 from typing import Union
 
@@ -44,8 +43,7 @@ def retry_decorator(func):
             self.redis_pool = self._get_redis_connection()
             return await func(self, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in {func.__name__}: {str(e)}")
             return None
 
     return wrapper
@@ -80,8 +78,7 @@ class JimdbApRedis:
         try:
             self.redis_pool = self._get_redis_connection()
         except Exception as e:
-            logger.error(f"Error while creating Redis pool: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error while creating Redis pool: {str(e)}")
 
     def _get_redis_connection(self):
         """Create and configure a Redis connection pool.
@@ -641,14 +641,20 @@ class VearchDB(BaseVectorDB):
         """
         ids = await self.recall_by_appname(app_name)
 
-        # Delete each document individually
-        for doc_id in ids:
-            await self.vearch_tools.delete_by_docid(
-                self.config.db_name,
-                self.config.tool_space_name,
-                self.config.router_url,
-                doc_id,
-            )
+        # The router API deletes one document per request, so overlap the
+        # requests while bounding how many are in flight at once
+        semaphore = asyncio.Semaphore(16)
+
+        async def delete(doc_id):
+            async with semaphore:
+                await self.vearch_tools.delete_by_docid(
+                    self.config.db_name,
+                    self.config.tool_space_name,
+                    self.config.router_url,
+                    doc_id,
+                )
+
+        await asyncio.gather(*(delete(doc_id) for doc_id in ids))
         return
 
     async def recall_by_appname(self, app_name):
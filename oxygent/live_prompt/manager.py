@@ -394,6 +394,38 @@ class PromptManager:
             logger.error(f"Failed to get prompt {prompt_key}: {e}")
             return None
 
+    async def exists_prompt(self, prompt_key: str) -> bool:
+        """Check whether a prompt exists without fetching its content.
+
+        Answers from the cache when possible; otherwise asks the database for
+        the document id only, so large prompt bodies are not transferred.
+
+        Args:
+            prompt_key (str): The unique identifier for the prompt.
+
+        Returns:
+            bool: True if the prompt exists, False otherwise.
+        """
+        if prompt_key in self._prompt_cache:
+            return True
+
+        try:
+            response = await self.db_client.search(
+                index_name=self.index_name,
+                body={
+                    "query": {"term": {"_id": prompt_key}},
+                    "_source": False,
+                    "size": 1,
+                },
+            )
+        except Exception as e:
+            logger.debug(f"Failed to check prompt {prompt_key}: {e}")
+            return False
+
+        if response is None:
+            return False
+        return bool(response.get("hits", {}).get("hits"))
+
     def clear_cache(self, prompt_key: str = None):
         """Clear cache for specific key or all keys.
 
@@ -446,7 +478,7 @@ class PromptManager:
             query = {
                 "query": {
                     "bool": {
-                        "must": [
+                        "filter": [
                             {"term": {"prompt_key": prompt_key}},
                             {"term": {"is_history": True}},
                         ]
@@ -492,6 +524,39 @@ class PromptManager:
             logger.error(f"Failed to get prompt history for {prompt_key}: {e}")
             return []
 
+    async def get_prompt_version(
+        self, prompt_key: str, version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single archived version of a prompt.
+
+        History documents are stored under ``{prompt_key}_v{version}``, so the
+        version is fetched by id instead of scanning the whole history.
+
+        Args:
+            prompt_key (str): The unique identifier for the prompt.
+            version (int): The archived version number.
+
+        Returns:
+            Optional[Dict[str, Any]]: The archived prompt data if found, None otherwise.
+        """
+        try:
+            response = await self.db_client.search(
+                index_name=f"{self.index_name}_history",
+                body={
+                    "query": {"term": {"_id": f"{prompt_key}_v{version}"}},
+                    "size": 1,
+                },
+            )
+            if response is None:
+                return None
+
+            hits = response.get("hits", {}).get("hits", [])
+            return hits[0]["_source"] if hits else None
+
+        except Exception as e:
+            logger.error(f"Failed to get version {version} of prompt {prompt_key}: {e}")
+            return None
+
     async def revert_to_version(self, prompt_key: str, target_version: int) -> bool:
         """Revert prompt to a specific version.
 
@@ -529,12 +594,9 @@ class PromptManager:
                 logger.debug(f"Found history version {target_version} for {prompt_key}")
 
             except Exception as e:
-                logger.error(
+                logger.exception(
                     f"Version {target_version} not found for {prompt_key}: {e}"
                 )
-                import traceback
-
-                traceback.print_exc()
                 return False
 
             # Clear cache before reverting to ensure fresh data
@@ -563,12 +625,9 @@ class PromptManager:
             return success
 
         except Exception as e:
-            logger.error(
+            logger.exception(
                 f"Failed to revert {prompt_key} to version {target_version}: {e}"
             )
-            import traceback
-
-            traceback.print_exc()
             return False
 
     async def list_prompts(
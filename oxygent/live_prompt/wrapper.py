@@ -3,8 +3,9 @@ Live Prompt Agent Wrapper - Simplified
 Provides hot-reload functionality for agent prompts with real-time updates
 """
 
+import asyncio
 import logging
-from typing import Dict
+from typing import Dict, Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +13,11 @@ logger = logging.getLogger(__name__)
 class DynamicAgentManager:
     """Simplified dynamic agent manager"""
 
-    def __init__(self):
+    def __init__(self, max_concurrent_reloads: int = 8):
         self.agent_prompt_mapping: Dict[str, str] = {}
         self.mas_instance = None
+        # Upper bound on agents reloading their prompt at the same time
+        self.max_concurrent_reloads = max_concurrent_reloads
 
     def register_agents_from_mas(self, mas_instance):
         """
@@ -139,11 +142,31 @@ class DynamicAgentManager:
             return False
         except Exception as e:
             logger.error(f"Failed to update prompt for {agent_name}: {e}")
-            import traceback
-
-            logger.debug(traceback.format_exc())
+            logger.debug("Prompt update traceback", exc_info=True)
             return False
 
+    async def _update_agent_prompts(
+        self, agent_names: Iterable[str]
+    ) -> Dict[str, bool]:
+        """
+        Update prompts for several agents concurrently
+
+        Args:
+            agent_names: Names of the agents to update
+
+        Returns:
+            Dict[str, bool]: Update results for each agent, in the given order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_reloads)
+
+        async def update(agent_name: str) -> bool:
+            async with semaphore:
+                return await self.update_agent_prompt(agent_name)
+
+        agent_names = list(agent_names)
+        successes = await asyncio.gather(*(update(name) for name in agent_names))
+        return dict(zip(agent_names, successes))
+
     async def update_all_prompts(self) -> Dict[str, bool]:
         """
         Update prompts for all agents
@@ -151,9 +174,7 @@ class DynamicAgentManager:
         Returns:
             Dict[str, bool]: Update results for each agent
         """
-        results = {}
-        for agent_name in self.agent_prompt_mapping.keys():
-            results[agent_name] = await self.update_agent_prompt(agent_name)
+        results = await self._update_agent_prompts(self.agent_prompt_mapping.keys())
 
         success_count = sum(1 for success in results.values() if success)
         total_count = len(results)
@@ -173,10 +194,11 @@ class DynamicAgentManager:
         Returns:
             Dict[str, bool]: Update results for each agent
         """
-        results = {}
-        for agent_name, key in self.agent_prompt_mapping.items():
-            if key == prompt_key:
-                results[agent_name] = await self.update_agent_prompt(agent_name)
+        results = await self._update_agent_prompts(
+            agent_name
+            for agent_name, key in self.agent_prompt_mapping.items()
+            if key == prompt_key
+        )
 
         if results:
             success_count = sum(1 for success in results.values() if success)
@@ -227,6 +249,48 @@ async def setup_dynamic_agents(mas_instance):
         logger.info("Dynamic agent manager setup failed")
 
 
+# Agent class -> class name, shared across auto-save runs
+_type_name_cache: Dict[type, str] = {}
+
+
+def _build_prompt_record(agent_name: str, agent_instance, prompt_key: str):
+    """
+    Build the save_prompt arguments for an agent's current prompt
+
+    Args:
+        agent_name: Agent name
+        agent_instance: Agent instance
+        prompt_key: Registered prompt key of the agent
+
+    Returns:
+        tuple: (agent_name, save_prompt keyword arguments)
+    """
+    # Get agent's current prompt
+    prompt_content = getattr(agent_instance, "prompt", "")
+    if not prompt_content:
+        # Try to get a default prompt or description
+        prompt_content = getattr(
+            agent_instance, "description", "Default prompt for " + agent_name
+        )
+
+    # Determine agent type
+    cls = type(agent_instance)
+    agent_type = _type_name_cache.get(cls)
+    if agent_type is None:
+        agent_type = _type_name_cache[cls] = cls.__name__
+
+    return agent_name, {
+        "prompt_key": prompt_key,
+        "prompt_content": prompt_content,
+        "agent_type": agent_type,
+        "is_active": True,
+        "version": 1,
+        "description": "Auto-generated prompt for " + agent_name,
+        "category": "agent",
+        "created_by": "system_auto_setup",
+    }
+
+
 async def auto_save_agent_prompts_to_database(mas_instance):
     """
     Auto-save existing agent prompts to database for first-time setup
@@ -245,42 +309,23 @@ async def auto_save_agent_prompts_to_database(mas_instance):
         existing_keys = {prompt.get("prompt_key") for prompt in existing_prompts}
 
         saved_count = 0
-        skipped_count = 0
-
-        # Save prompts for registered live prompt agents only
-        for agent_name in dynamic_agent_manager.agent_prompt_mapping.keys():
-            agent_instance = mas_instance.oxy_name_to_oxy[agent_name]
-            # Use the prompt_key that was registered (may be custom or default)
-            prompt_key = dynamic_agent_manager.agent_prompt_mapping[agent_name]
-
-            # Skip if prompt already exists in database
-            if prompt_key in existing_keys:
-                skipped_count += 1
-                continue
-
-            # Get agent's current prompt
-            prompt_content = getattr(agent_instance, "prompt", "")
-            if not prompt_content:
-                # Try to get a default prompt or description
-                prompt_content = getattr(
-                    agent_instance, "description", f"Default prompt for {agent_name}"
-                )
+        agent_prompt_mapping = dynamic_agent_manager.agent_prompt_mapping
 
-            # Determine agent type
-            agent_type = type(agent_instance).__name__
+        # Assemble the records for registered live prompt agents only, skipping
+        # prompt keys (custom or default) that already exist in the database
+        records = [
+            _build_prompt_record(
+                agent_name, mas_instance.oxy_name_to_oxy[agent_name], prompt_key
+            )
+            for agent_name, prompt_key in agent_prompt_mapping.items()
+            if prompt_key not in existing_keys
+        ]
+        skipped_count = len(agent_prompt_mapping) - len(records)
 
+        for agent_name, record in records:
             # Save prompt to database
             try:
-                success = await manager.save_prompt(
-                    prompt_key=prompt_key,
-                    prompt_content=prompt_content,
-                    agent_type=agent_type,
-                    is_active=True,
-                    version=1,
-                    description=f"Auto-generated prompt for {agent_name}",
-                    category="agent",
-                    created_by="system_auto_setup",
-                )
+                success = await manager.save_prompt(**record)
 
                 if success:
                     saved_count += 1
@@ -297,10 +342,7 @@ async def auto_save_agent_prompts_to_database(mas_instance):
             logger.info(f"⏭Skipped {skipped_count} existing prompts")
 
     except Exception as e:
-        logger.error(f"Failed to auto-save agent prompts: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception(f"Failed to auto-save agent prompts: {e}")
 
 
 # Convenient hot-reload functions
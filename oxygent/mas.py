@@ -20,7 +20,6 @@ NOTE: This module contains the following parts:
 import asyncio
 import json
 import os
-import traceback
 from collections import OrderedDict
 from typing import Any, Callable, Dict, List, Optional
 
@@ -42,7 +41,7 @@ from .oxy.base_flow import BaseFlow
 from .oxy.base_tool import BaseTool
 from .oxy.llms.base_llm import BaseLLM
 from .oxy.mcp_tools.base_mcp_client import BaseMCPClient
-from .routes import router
+from .routes import invalidate_agent_cache, router
 from .schemas import OxyRequest, OxyResponse, SSEMessage, WebResponse
 from .utils.common_utils import (
     generate_uuid,
@@ -191,7 +190,21 @@ class MAS(BaseModel):
         """
         if oxy.name in self.oxy_name_to_oxy:
             raise Exception(f"oxy [{oxy.name}] already exists.")
-        self.oxy_name_to_oxy[oxy.name] = oxy
+        self.register_oxy(oxy.name, oxy)
+
+    def register_oxy(self, name: str, oxy: Oxy):
+        """Store an Oxy object in the registry under ``name``.
+
+        Unlike :meth:`add_oxy` this replaces an existing entry. All registry
+        writes go through here so the cached ``/get_agents`` listing is
+        dropped whenever the registry changes.
+
+        Args:
+            name: Registry key for the component.
+            oxy: The component instance to store.
+        """
+        self.oxy_name_to_oxy[name] = oxy
+        invalidate_agent_cache()
 
     def add_oxy_list(self, oxy_list: list[Oxy]):
         """Register a list of Oxy objects.
@@ -284,153 +297,168 @@ class MAS(BaseModel):
             self.es_client = db_factory.get_instance(JesEs, hosts, user, password)
         else:
             self.es_client = db_factory.get_instance(LocalEs)
+        # The tables are independent, so create them concurrently instead of
+        # paying an exists check plus a create round trip for each in turn
+        index_creations = []
         # trace table
-        await self.es_client.create_index(
-            Config.get_app_name() + "_trace",
-            {
-                "mappings": {
-                    "properties": {
-                        "request_id": {"type": "keyword"},
-                        "group_id": {"type": "keyword"},
-                        "group_data": Config.get_es_schema_group_data(),
-                        "trace_id": {"type": "keyword"},
-                        "shared_data": Config.get_es_schema_shared_data(),
-                        "from_trace_id": {"type": "keyword"},
-                        "root_trace_ids": {"type": "keyword"},
-                        "input": {"type": "text"},
-                        "callee": {"type": "keyword"},
-                        "output": {"type": "text"},
-                        "create_time": {
-                            "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
-                            "type": "date",
+        index_creations.append(
+            self.es_client.create_index(
+                Config.get_app_name() + "_trace",
+                {
+                    "mappings": {
+                        "properties": {
+                            "request_id": {"type": "keyword"},
+                            "group_id": {"type": "keyword"},
+                            "group_data": Config.get_es_schema_group_data(),
+                            "trace_id": {"type": "keyword"},
+                            "shared_data": Config.get_es_schema_shared_data(),
+                            "from_trace_id": {"type": "keyword"},
+                            "root_trace_ids": {"type": "keyword"},
+                            "input": {"type": "text"},
+                            "callee": {"type": "keyword"},
+                            "output": {"type": "text"},
+                            "create_time": {
+                                "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
+                                "type": "date",
+                            },
                         },
                     },
+                    "settings": Config.get_es_settings_config(),
                 },
-                "settings": Config.get_es_settings_config(),
-            },
+            )
         )
         # message table
         if Config.get_message_is_stored():
-            await self.es_client.create_index(
-                Config.get_app_name() + "_message",
+            index_creations.append(
+                self.es_client.create_index(
+                    Config.get_app_name() + "_message",
+                    {
+                        "mappings": {
+                            "properties": {
+                                "message_id": {"type": "keyword"},
+                                "group_id": {"type": "keyword"},
+                                "trace_id": {"type": "keyword"},
+                                "node_id": {"type": "keyword"},
+                                "node_name": {"type": "keyword"},
+                                "message": {"type": "text"},
+                                "message_type": {"type": "keyword"},
+                                "message_event": {"type": "keyword"},
+                                "message_timestamp": {"type": "long"},
+                                "create_time": {
+                                    "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
+                                    "type": "date",
+                                },
+                            },
+                        },
+                        "settings": Config.get_es_settings_config(),
+                    },
+                )
+            )
+        # node table
+        index_creations.append(
+            self.es_client.create_index(
+                Config.get_app_name() + "_node",
                 {
                     "mappings": {
                         "properties": {
-                            "message_id": {"type": "keyword"},
+                            "node_id": {"type": "keyword"},
+                            "node_type": {"type": "keyword"},
                             "group_id": {"type": "keyword"},
                             "trace_id": {"type": "keyword"},
-                            "node_id": {"type": "keyword"},
-                            "node_name": {"type": "keyword"},
-                            "message": {"type": "text"},
-                            "message_type": {"type": "keyword"},
-                            "message_event": {"type": "keyword"},
-                            "message_timestamp": {"type": "long"},
+                            "caller": {"type": "keyword"},
+                            "callee": {"type": "keyword"},
+                            "parallel_id": {"type": "keyword"},
+                            "father_node_id": {"type": "keyword"},
+                            "input": {"type": "text"},
+                            "input_md5": {"type": "keyword"},
+                            "output": {"type": "text"},
+                            "state": {"type": "keyword"},
+                            "extra": {"type": "text"},
+                            "call_stack": {"type": "text"},
+                            "node_id_stack": {"type": "text"},
+                            "pre_node_ids": {"type": "text"},
+                            "shared_data": Config.get_es_schema_shared_data(),
                             "create_time": {
                                 "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
                                 "type": "date",
                             },
+                            "update_time": {
+                                "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
+                                "type": "date",
+                            },
                         },
                     },
                     "settings": Config.get_es_settings_config(),
                 },
             )
-        # node table
-        await self.es_client.create_index(
-            Config.get_app_name() + "_node",
-            {
-                "mappings": {
-                    "properties": {
-                        "node_id": {"type": "keyword"},
-                        "node_type": {"type": "keyword"},
-                        "group_id": {"type": "keyword"},
-                        "trace_id": {"type": "keyword"},
-                        "caller": {"type": "keyword"},
-                        "callee": {"type": "keyword"},
-                        "parallel_id": {"type": "keyword"},
-                        "father_node_id": {"type": "keyword"},
-                        "input": {"type": "text"},
-                        "input_md5": {"type": "keyword"},
-                        "output": {"type": "text"},
-                        "state": {"type": "keyword"},
-                        "extra": {"type": "text"},
-                        "call_stack": {"type": "text"},
-                        "node_id_stack": {"type": "text"},
-                        "pre_node_ids": {"type": "text"},
-                        "shared_data": Config.get_es_schema_shared_data(),
-                        "create_time": {
-                            "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
-                            "type": "date",
-                        },
-                        "update_time": {
-                            "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
-                            "type": "date",
-                        },
-                    },
-                },
-                "settings": Config.get_es_settings_config(),
-            },
         )
         # history table
-        await self.es_client.create_index(
-            Config.get_app_name() + "_history",
-            {
-                "mappings": {
-                    "properties": {
-                        "history_id": {"type": "keyword"},
-                        "session_name": {"type": "keyword"},
-                        "trace_id": {"type": "keyword"},
-                        "memory": {"type": "text"},
-                        "create_time": {
-                            "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
-                            "type": "date",
+        index_creations.append(
+            self.es_client.create_index(
+                Config.get_app_name() + "_history",
+                {
+                    "mappings": {
+                        "properties": {
+                            "history_id": {"type": "keyword"},
+                            "session_name": {"type": "keyword"},
+                            "trace_id": {"type": "keyword"},
+                            "memory": {"type": "text"},
+                            "create_time": {
+                                "format": "yyyy-MM-dd HH:mm:ss.SSSSSSSSS",
+                                "type": "date",
+                            },
                         },
                     },
+                    "settings": Config.get_es_settings_config(),
                 },
-                "settings": Config.get_es_settings_config(),
-            },
+            )
         )
         # prompt table
-        await self.es_client.create_index(
-            Config.get_app_name() + "_prompt",
-            {
-                "mappings": {
-                    "properties": {
-                        "prompt_key": {
-                            "type": "keyword"  # Prompt key for exact matching
-                        },
-                        "prompt_content": {
-                            "type": "text",
-                            "analyzer": "standard",  # Prompt content
-                        },
-                        "description": {
-                            "type": "text"  # Prompt description
-                        },
-                        "category": {
-                            "type": "keyword"  # Category: system, expert, workflow, etc.
-                        },
-                        "agent_type": {
-                            "type": "keyword"  # Corresponding Agent type
-                        },
-                        "version": {
-                            "type": "integer"  # Version number
-                        },
-                        "is_active": {
-                            "type": "boolean"  # Whether active
-                        },
-                        "created_at": {"type": "date"},
-                        "updated_at": {"type": "date"},
-                        "created_by": {
-                            "type": "keyword"  # Creator
-                        },
-                        "tags": {
-                            "type": "keyword"  # Tags
-                        },
-                    }
+        index_creations.append(
+            self.es_client.create_index(
+                Config.get_app_name() + "_prompt",
+                {
+                    "mappings": {
+                        "properties": {
+                            "prompt_key": {
+                                "type": "keyword"  # Prompt key for exact matching
+                            },
+                            "prompt_content": {
+                                "type": "text",
+                                "analyzer": "standard",  # Prompt content
+                            },
+                            "description": {
+                                "type": "text"  # Prompt description
+                            },
+                            "category": {
+                                "type": "keyword"  # Category: system, expert, workflow, etc.
+                            },
+                            "agent_type": {
+                                "type": "keyword"  # Corresponding Agent type
+                            },
+                            "version": {
+                                "type": "integer"  # Version number
+                            },
+                            "is_active": {
+                                "type": "boolean"  # Whether active
+                            },
+                            "created_at": {"type": "date"},
+                            "updated_at": {"type": "date"},
+                            "created_by": {
+                                "type": "keyword"  # Creator
+                            },
+                            "tags": {
+                                "type": "keyword"  # Tags
+                            },
+                        }
+                    },
+                    "settings": Config.get_es_settings_config(),
                 },
-                "settings": Config.get_es_settings_config(),
-            },
+            )
         )
 
+        await asyncio.gather(*index_creations)
+
         # init redis client
         redis_config = Config.get_redis_config()
         if redis_config:
@@ -791,15 +819,36 @@ class MAS(BaseModel):
 
             group_data = payload.get("group_data", {})
 
-            if "restart_node_id" in payload and payload.get("restart_node_id"):
-                es_response = await self.es_client.search(
+            # The restart node and the parent trace are independent lookups, so
+            # run them concurrently (asyncio.sleep(0) stands in for a skipped one)
+            restart_node_id = payload.get("restart_node_id")
+            from_trace_id = payload.get("from_trace_id")
+            es_response, es_response_group_id = await asyncio.gather(
+                self.es_client.search(
                     Config.get_app_name() + "_node",
                     {
-                        "query": {"term": {"node_id": payload["restart_node_id"]}},
+                        "query": {"term": {"node_id": restart_node_id}},
+                        "_source": ["trace_id", "update_time"],
+                        "track_total_hits": False,
                         "size": 1,
                     },
                 )
+                if restart_node_id
+                else asyncio.sleep(0),
+                self.es_client.search(
+                    Config.get_app_name() + "_trace",
+                    {
+                        "query": {"term": {"_id": from_trace_id}},
+                        "_source": ["group_id", "group_data"],
+                        "track_total_hits": False,
+                        "size": 1,
+                    },
+                )
+                if from_trace_id
+                else asyncio.sleep(0),
+            )
 
+            if restart_node_id:
                 if es_response["hits"]["hits"]:
                     restart_node_data = es_response["hits"]["hits"][0]["_source"]
 
@@ -839,15 +888,7 @@ class MAS(BaseModel):
             if "current_trace_id" in payload and payload["current_trace_id"]:
                 oxy_request.current_trace_id = payload["current_trace_id"]
             # Set group_id: inherit if from_trace_id is provided, else new
-            if "from_trace_id" in payload and payload["from_trace_id"]:
-                es_response_group_id = await self.es_client.search(
-                    Config.get_app_name() + "_trace",
-                    {
-                        "query": {"term": {"_id": payload["from_trace_id"]}},
-                        "size": 1,
-                    },
-                )
-
+            if from_trace_id:
                 hits = es_response_group_id.get("hits", {}).get("hits", [])
                 if hits:
                     oxy_request.group_id = hits[0]["_source"].get("group_id", "")
@@ -901,7 +942,7 @@ class MAS(BaseModel):
                 )
             return oxy_response
         except Exception:
-            logger.error(traceback.format_exc())
+            logger.exception("Error while chatting with the agent")
             raise
         finally:
             self.clear_queues(oxy_request.current_trace_id)
@@ -1035,6 +1076,7 @@ class MAS(BaseModel):
 
         import uvicorn
         from fastapi import APIRouter, FastAPI, Request
+        from fastapi.responses import ORJSONResponse
         from fastapi.routing import APIRoute
         from fastapi.staticfiles import StaticFiles
         from sse_starlette.sse import EventSourceResponse
@@ -1077,7 +1119,7 @@ class MAS(BaseModel):
                     )
             return banks
 
-        app = FastAPI()
+        app = FastAPI(default_response_class=ORJSONResponse)
 
         from fastapi.middleware.cors import CORSMiddleware
 
@@ -1123,8 +1165,20 @@ class MAS(BaseModel):
         However the path would not be sent here.
         """
 
+        # (agent_organization, payload) of the last /get_organization call; the
+        # organization object is replaced whenever it is rebuilt
+        organization_cache = [None, None]
+
         @app.get("/get_organization")
         def get_organization():
+            if organization_cache[0] is not self.agent_organization:
+                organization_cache[:] = [
+                    self.agent_organization,
+                    build_organization_data(self.agent_organization),
+                ]
+            return WebResponse.ok_dict(organization_cache[1])
+
+        def build_organization_data(agent_organization):
             def add_path(node, current_path=None):
                 if current_path is None:
                     current_path = []
@@ -1158,12 +1212,10 @@ class MAS(BaseModel):
                 unique_names = list(OrderedDict.fromkeys(result))
                 return {name: idx for idx, name in enumerate(unique_names)}
 
-            return WebResponse(
-                data={
-                    "id_dict": get_agent_to_id(self.agent_organization),
-                    "organization": add_path(self.agent_organization),
-                }
-            ).to_dict()
+            return {
+                "id_dict": get_agent_to_id(agent_organization),
+                "organization": add_path(agent_organization),
+            }
 
         """
         When teh frontend is loaded, it will send the first query to user.
@@ -1171,19 +1223,19 @@ class MAS(BaseModel):
 
         @app.get("/get_first_query")
         def get_first_query():
-            return WebResponse(
-                data={"first_query": self.first_query if self.first_query else ""}
-            ).to_dict()
+            return WebResponse.ok_dict(
+                {"first_query": self.first_query if self.first_query else ""}
+            )
 
         @app.get("/get_welcome_message")
         def get_welcome_message():
-            return WebResponse(
-                data={
+            return WebResponse.ok_dict(
+                {
                     "welcome_message": self.welcome_message
                     if self.welcome_message
                     else ""
                 }
-            ).to_dict()
+            )
 
         @app.get("/get_agents")
         def get_agents():
@@ -1213,7 +1265,7 @@ class MAS(BaseModel):
             if hasattr(self, "agent_organization") and self.agent_organization:
                 extract_agents(self.agent_organization)
 
-            return WebResponse(data={"agents": agents}).to_dict()
+            return WebResponse.ok_dict({"agents": agents})
 
         async def request_to_payload(request: Request):
             if request.method == "GET":
@@ -1223,9 +1275,9 @@ class MAS(BaseModel):
                     try:
                         payload = json.loads(params["payload"])
                     except Exception as e:
-                        return WebResponse(
-                            code=400, message=f"can not convert data into JSON: {e}"
-                        ).to_dict()
+                        return WebResponse.err_dict(
+                            400, f"can not convert data into JSON: {e}"
+                        )
             elif request.method == "POST":
                 payload = await request.json()
 
@@ -1302,7 +1354,7 @@ class MAS(BaseModel):
                 lambda future: self.active_tasks.pop(current_trace_id, None)
             )
             self.active_tasks[current_trace_id] = task
-            return WebResponse().to_dict()
+            return WebResponse.ok_dict()
 
         @app.api_route("/async/trace", methods=["GET", "POST"])
         async def async_trace(request: Request):
@@ -1326,11 +1378,11 @@ class MAS(BaseModel):
             payload = await request_to_payload(request)
             channel_id = payload.get("channel_id", "")
             if channel_id not in self.feedback_dict:
-                return WebResponse(code=400, message="illegal channel_id").to_dict()
+                return WebResponse.err_dict(400, "illegal channel_id")
             queue = self.feedback_dict[channel_id]
             data = payload.get("data", None)
             await queue.put(data)
-            return WebResponse().to_dict()
+            return WebResponse.ok_dict()
 
         async def run_uvicorn():
             """Run the Uvicorn server with the FastAPI app."""
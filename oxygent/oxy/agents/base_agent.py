@@ -53,7 +53,12 @@ class BaseAgent(BaseFlow):
                 # Query Elasticsearch for the parent trace information
                 es_response = await self.mas.es_client.search(
                     Config.get_app_name() + "_trace",
-                    {"query": {"term": {"_id": oxy_request.from_trace_id}}},
+                    {
+                        "query": {"term": {"_id": oxy_request.from_trace_id}},
+                        "_source": ["root_trace_ids"],
+                        "track_total_hits": False,
+                        "size": 1,
+                    },
                 )
 
                 # Extract root trace IDs from the parent trace if available
@@ -272,7 +272,7 @@ class LocalAgent(BaseAgent):
                 new_instance.func_format_input = self.func_format_input
                 new_instance.func_format_output = self.func_format_output
                 team_names.append(new_instance.name)
-                self.mas.oxy_name_to_oxy[new_instance.name] = new_instance
+                self.mas.register_oxy(new_instance.name, new_instance)
             from .parallel_agent import ParallelAgent
 
             parallel_agent = ParallelAgent(
@@ -283,7 +283,7 @@ class LocalAgent(BaseAgent):
                 is_master=self.is_master,
             )
             parallel_agent.set_mas(self.mas)
-            self.mas.oxy_name_to_oxy[self.name] = parallel_agent
+            self.mas.register_oxy(self.name, parallel_agent)
 
     async def _get_history(
         self, oxy_request: OxyRequest, is_get_user_master_session=False
@@ -309,7 +309,7 @@ class LocalAgent(BaseAgent):
                 {
                     "query": {
                         "bool": {
-                            "must": [
+                            "filter": [
                                 {
                                     "terms": {
                                         "trace_id": oxy_request.root_trace_ids
@@ -147,7 +147,7 @@ class ReActAgent(LocalAgent):
             {
                 "query": {
                     "bool": {
-                        "must": [
+                        "filter": [
                             {
                                 "terms": {
                                     "trace_id": oxy_request.root_trace_ids
@@ -192,12 +192,9 @@ class ReActAgent(LocalAgent):
                 scores.append(self.func_map_memory_order(i + 1) * weight)
 
             # Sort indices by score (highest first) for priority selection
-            sorted_scores = [
-                index
-                for index, _ in sorted(
-                    enumerate(scores), key=lambda x: x[1], reverse=True
-                )
-            ]
+            sorted_scores = sorted(
+                range(len(scores)), key=scores.__getitem__, reverse=True
+            )
 
             # Apply token-based filtering to stay within limits
             count_token = 0
@@ -81,6 +81,9 @@ class SSEOxyGent(RemoteAgent):
                 "Content-Type": "application/json",
             }
         )
+        # The payload does not change across retries, so encode it only once
+        body = json.dumps(payload).encode("utf-8")
+        headers["Content-Length"] = str(len(body))
 
         max_retries = 3
         base_retry_delay = 1.0  
@@ -93,7 +96,7 @@ class SSEOxyGent(RemoteAgent):
             try:
                 async with aiohttp.ClientSession() as session:
                     async with session.post(
-                        url, data=json.dumps(payload), headers=headers
+                        url, data=body, headers=headers
                     ) as resp:
                         if resp.status != 200:
                             raise aiohttp.ClientResponseError(
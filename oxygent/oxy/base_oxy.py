@@ -9,7 +9,6 @@ import asyncio
 import inspect
 import json
 import logging
-import traceback
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Optional
 
@@ -274,12 +273,14 @@ class Oxy(BaseModel, ABC):
                 {
                     "query": {
                         "bool": {
-                            "must": [
+                            "filter": [
                                 {"term": {"trace_id": oxy_request.reference_trace_id}},
                                 {"term": {"input_md5": oxy_request.input_md5}},
                             ]
                         }
                     },
+                    "_source": ["update_time", "output", "state", "extra"],
+                    "track_total_hits": False,
                     "size": 1,
                 },
             )
@@ -653,8 +654,8 @@ class Oxy(BaseModel, ABC):
                             "node_id": oxy_request.node_id,
                         },
                     )
-                    logger.error(
-                        traceback.format_exc(),
+                    logger.exception(
+                        f"Error executing oxy {self.name}",
                         extra={
                             "trace_id": oxy_request.current_trace_id,
                             "node_id": oxy_request.node_id,
@@ -663,9 +664,8 @@ class Oxy(BaseModel, ABC):
                     if attempt < self.retries:
                         await asyncio.sleep(self.delay)
                     else:
-                        error_msg = traceback.format_exc()
-                        logger.error(
-                            f"Max retries reached. Failed. {error_msg}",
+                        logger.exception(
+                            "Max retries reached. Failed.",
                             extra={
                                 "trace_id": oxy_request.current_trace_id,
                                 "node_id": oxy_request.node_id,
@@ -180,7 +180,7 @@ Previous answer: {previous_answer}""",
                     output=f"Final answer optimized through {current_round + 1} rounds of reflexion:\n\n{current_answer}",
                     extra={
                         "reflexion_rounds": current_round + 1,
-                        "final_evaluation": evaluation.dict(),
+                        "final_evaluation": evaluation.model_dump(mode="json"),
                     },
                 )
 
@@ -232,7 +232,7 @@ Please provide the best possible final answer considering all the feedback above
             output=f"Answer after {self.max_reflexion_rounds + 1} rounds of reflexion attempts:\n\n{final_response.output}",
             extra={
                 "reflexion_rounds": self.max_reflexion_rounds + 1,
-                "final_evaluation": evaluation.dict(),
+                "final_evaluation": evaluation.model_dump(mode="json"),
                 "reached_max_rounds": True,
             },
         )
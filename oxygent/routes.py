@@ -18,17 +18,20 @@ Typical usage example::
     curl http://localhost:8000/check_alive  #→ {"alive": 1}
 """
 
-import json
+import asyncio
+import functools
 import logging
 import os
 import re
-import traceback
+import tempfile
 from datetime import datetime
+from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 import aiofiles
+import orjson
 from fastapi import APIRouter, File, UploadFile, HTTPException, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from pydantic import BaseModel
 
 from .config import Config
@@ -36,11 +39,134 @@ from .databases.db_es import JesEs, LocalEs
 from .db_factory import DBFactory
 from .oxy_factory import OxyFactory, SecurityError
 from .schemas import OxyRequest, WebResponse
+from .utils.common_utils import get_md5
 from .utils.data_utils import add_post_and_child_node_ids
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Number of trace nodes fetched per ES request when walking a trace
+_TRACE_PAGE_SIZE = 500
+
+# Matches a whole-value environment variable reference such as ``${API_KEY}``
+_ENV_VAR_RE = re.compile(r"^\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}$")
+
+# Type conversion applied to LLM parameters posted to /call
+_LLM_PARAMS_TYPES = {
+    "temperature": float,
+    "max_tokens": int,
+    "top_p": float,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_env_value_to_key():
+    """Map environment variable values back to their names.
+
+    The inversion is built once per process; call
+    ``_get_env_value_to_key.cache_clear()`` after changing ``os.environ`` at
+    runtime.
+
+    Returns:
+        dict: ``{value: name}`` for every environment variable.
+    """
+    return {v: k for k, v in os.environ.items()}
+
+
+@functools.lru_cache(maxsize=1)
+def get_es_client():
+    """Return the process-wide ES client used by the routes.
+
+    The client is resolved once through :class:`DBFactory`, so it is the same
+    instance the MAS writes to, and then reused by every request.
+
+    Returns:
+        BaseEs: A ``JesEs`` client when ES is configured, otherwise ``LocalEs``.
+    """
+    db_factory = DBFactory()
+    jes_config = Config.get_es_config()
+    if jes_config:
+        hosts = jes_config["hosts"]
+        user = jes_config["user"]
+        password = jes_config["password"]
+        return db_factory.get_instance(JesEs, hosts, user, password)
+    return db_factory.get_instance(LocalEs)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_node_index_name():
+    """Return the name of the ES index holding trace nodes.
+
+    Like :func:`get_es_client` this is resolved on the first request, after
+    the MAS has set the app name, and reused afterwards.
+
+    Returns:
+        str: ``"<app_name>_node"``.
+    """
+    return Config.get_app_name() + "_node"
+
+
+class _SearchFailedError(Exception):
+    """An ES search returned no response; the client already logged the cause."""
+
+
+def _search_preference(key):
+    """Derive an ES search preference from a request-supplied id.
+
+    Custom preference strings must not start with ``_``, so the raw id
+    cannot be passed through; its digest is stable per id and always safe.
+
+    Args:
+        key: The trace or node id the searches are about.
+
+    Returns:
+        str: Hex digest of ``key``.
+    """
+    return get_md5(key)
+
+
+async def _iter_search_pages(
+    es_client, index_name, body, first_response=None, preference=None
+):
+    """Iterate over every hit of a sorted ES query, one page at a time.
+
+    Pages are fetched lazily with ``search_after``, so the caller can stop
+    early without loading the remaining hits.
+
+    Args:
+        es_client: ES client returned by :func:`get_es_client`.
+        index_name: Name of the index to search.
+        body: Search body whose ``sort`` ends with a unique tiebreaker field.
+        first_response: Already fetched response for the first page of
+            ``body``, e.g. from ``msearch``.
+        preference: ES search preference used for every page, so the whole
+            walk reads the same shard copies and sees one consistent order.
+
+    Yields:
+        list: The hits of each non-empty page.
+
+    Raises:
+        _SearchFailedError: If fetching a page failed. The ES client reports
+            failures by returning None, which must not be mistaken for an
+            empty or malformed page.
+    """
+    body = {**body, "size": _TRACE_PAGE_SIZE}
+    response = first_response or await es_client.search(
+        index_name, body, preference=preference
+    )
+    while True:
+        if response is None:
+            raise _SearchFailedError(
+                f"Search on {index_name} failed after {body.get('search_after')}"
+            )
+        hits = response["hits"]["hits"]
+        if hits:
+            yield hits
+        if len(hits) < _TRACE_PAGE_SIZE:
+            return
+        body["search_after"] = hits[-1]["sort"]
+        response = await es_client.search(index_name, body, preference=preference)
 
 
 # Basic route to redirect to the web interface
@@ -70,17 +196,18 @@ def check_alive():
 async def upload_file(file: UploadFile = File(...)):
     datetime_str = datetime.now().strftime("%Y%m%d%H%M%S")
     upload_dir = os.path.join(Config.get_cache_save_dir(), "uploads", datetime_str)
-    os.makedirs(upload_dir, exist_ok=True)
+    await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
     file_path = os.path.join(upload_dir, file.filename)
     pic_url = f"../static/{datetime_str}/{file.filename}"
 
-    # Save file asynchronously
-    async with aiofiles.open(file_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+    # Stream the upload to disk chunk by chunk to keep memory usage flat
+    buffer_size = Config.get_server_upload_buffer_size()
+    async with aiofiles.open(file_path, "wb", buffering=0) as f:
+        while chunk := await file.read(buffer_size):
+            await f.write(chunk)
 
     # Return file path
-    return WebResponse(data={"file_name": pic_url}).to_dict()
+    return WebResponse.ok_dict({"file_name": pic_url})
 
 
 @router.get("/node")
@@ -96,143 +223,188 @@ async def get_node_info(item_id: str):
         dict: A ``WebResponse``-compatible dictionary containing the node
         payload enriched with ``pre_id`` and ``next_id`` navigation helpers.
     """
-    db_factory = DBFactory()
-    if Config.get_es_config():
-        jes_config = Config.get_es_config()
-        hosts = jes_config["hosts"]
-        user = jes_config["user"]
-        password = jes_config["password"]
-        es_client = db_factory.get_instance(JesEs, hosts, user, password)
-    else:
-        es_client = db_factory.get_instance(LocalEs)
-    es_response = await es_client.search(
-        Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
-    )
+    es_client = get_es_client()
+    index_name = _get_node_index_name()
+    trace_query = {
+        # Only the node order is needed for navigation, and the node_id
+        # tiebreaker already comes back in each hit's sort values
+        "_source": False,
+        "sort": [{"create_time": {"order": "asc"}}, {"node_id": {"order": "asc"}}],
+        "track_total_hits": False,
+    }
     try:
-        datas = es_response["hits"]["hits"]
+        # Look item_id up as a node_id and as a trace_id in a single round trip;
+        # for a trace_id this also returns the first page of the trace and the
+        # first node of the trace in full
+        responses = await es_client.msearch(
+            index_name,
+            [
+                {"query": {"term": {"_id": item_id}}, "track_total_hits": False},
+                {
+                    "query": {"term": {"trace_id": item_id}},
+                    **trace_query,
+                    "size": _TRACE_PAGE_SIZE,
+                },
+                {
+                    "query": {"term": {"trace_id": item_id}},
+                    "size": 1,
+                    "sort": trace_query["sort"],
+                    "track_total_hits": False,
+                },
+            ],
+            preference=_search_preference(item_id),
+        )
+        if responses is None:
+            raise _SearchFailedError(f"Node lookup msearch on {index_name} failed")
+        node_response, trace_response, first_node_response = responses
+        datas = node_response["hits"]["hits"]
         if datas:
             node_data = datas[0]["_source"]
             trace_id = node_data["trace_id"]
+            """Get trace_id from trace table (abandoned)"""
+            """If error, get trace_id from node table."""
+            trace_response = None
         else:
             # puting item_id as trace_id
             trace_id = item_id
+            first_nodes = first_node_response["hits"]["hits"]
+            if not first_nodes:
+                return WebResponse.err_dict(400, "illegal node_id")
+            # puting item_id from trace_id, the first node of the trace is the
+            # one to show and it was already fetched along with the trace
+            node_data = first_nodes[0]["_source"]
+            item_id = node_data["node_id"]
+
+        # Walk the trace in pages only until the neighbours of item_id are known
+        pre_id, next_id, found = "", "", False
+        async for hits in _iter_search_pages(
+            es_client,
+            index_name,
+            {"query": {"term": {"trace_id": trace_id}}, **trace_query},
+            first_response=trace_response,
+            preference=_search_preference(trace_id),
+        ):
+            for data in hits:
+                node_id = data["sort"][-1]
+                if found:
+                    next_id = node_id
+                    break
+                if node_id == item_id:
+                    found = True
+                else:
+                    pre_id = node_id
+            if next_id:
+                break
 
-        """Get trace_id from trace table (abandoned)"""
-        """If error, get trace_id from node table."""
-        es_response = await es_client.search(
-            Config.get_app_name() + "_node",
-            {
-                "query": {"term": {"trace_id": trace_id}},  # all of the nodes
-                "size": 10000,
-                "sort": [{"create_time": {"order": "asc"}}],
-            },
-        )
-        node_ids = []
-        for data in es_response["hits"]["hits"]:
-            node_ids.append(data["_source"]["node_id"])
-
-        if len(node_ids) == 0:
-            return WebResponse(code=400, message="illegal node_id").to_dict()
-
-        if trace_id == item_id:
-            # puting item_id from trace_id，get node_id data for another time
-            item_id = node_ids[0]
-            es_response = await es_client.search(
-                Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
-            )
-            datas = es_response["hits"]["hits"]
-            node_data = datas[0]["_source"]
-
-        for i, node_id in enumerate(node_ids):
-            if item_id == node_id:
-                node_data["pre_id"] = node_ids[i - 1] if i >= 1 else ""
-                node_data["next_id"] = node_ids[i + 1] if i <= len(node_ids) - 2 else ""
-
-                if "input" in node_data:
-                    node_data["input"] = json.loads(node_data["input"])
-
-                if "prompt" in node_data["input"]["class_attr"]:
-                    del node_data["input"]["class_attr"]["prompt"]
-                env_value_to_key = {v: k for k, v in os.environ.items()}
-
-                # Generate the maximum and minimum values for the data range
-                node_data["data_range_map"] = dict()
-                for tree in [
-                    node_data["input"]["class_attr"],
-                    node_data["input"]["class_attr"].get("llm_params", dict()),
-                    node_data["input"]["arguments"],
-                ]:
-                    for k, v in tree.items():
-                        if v and isinstance(v, str) and v in env_value_to_key:
-                            tree[k] = f"${{{env_value_to_key[v]}}}"
-                        if isinstance(v, (int, float)) and not isinstance(v, bool):
-                            if v <= 1:
-                                max_value = 1
-                            else:
-                                max_value = v * 10
-                            node_data["data_range_map"][k] = {
-                                "min": 0,
-                                "max": max_value,
-                            }
-                return WebResponse(data=node_data).to_dict()
-
+        if not found:
+            # item_id resolved to a node, but the trace walk never reached it
+            return WebResponse.err_dict(400, "illegal node_id")
+
+        node_data["pre_id"] = pre_id
+        node_data["next_id"] = next_id
+
+        try:
+            if "input" in node_data:
+                node_data["input"] = orjson.loads(node_data["input"])
+            class_attr = node_data["input"]["class_attr"]
+            trees = [
+                class_attr,
+                class_attr.get("llm_params", dict()),
+                node_data["input"]["arguments"],
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            # Malformed node document; the stack trace adds nothing here
+            logger.warning(f"Invalid node data for {item_id}: {e!r}")
+            return WebResponse.err_dict(500, "遇到问题")
+
+        if "prompt" in class_attr:
+            del class_attr["prompt"]
+        env_value_to_key = _get_env_value_to_key()
+
+        # Generate the maximum and minimum values for the data range
+        data_range_map = node_data["data_range_map"] = dict()
+        for tree in trees:
+            for k, v in tree.items():
+                if v and isinstance(v, str) and v in env_value_to_key:
+                    tree[k] = f"${{{env_value_to_key[v]}}}"
+                # The input is decoded JSON, so exact type checks are safe
+                # and leave bool out without a second isinstance call
+                elif type(v) in (int, float):
+                    data_range_map[k] = {"min": 0, "max": 1 if v <= 1 else v * 10}
+        return WebResponse.ok_dict(node_data)
+
+    except _SearchFailedError:
+        # ES itself failed, not the data; keep the stack for the outage report
+        logger.exception(f"ES search failed while getting node info for {item_id}")
+        return WebResponse.err_dict(500, "遇到问题")
     except Exception:
-        error_msg = traceback.format_exc()
-        logger.error(error_msg)
-        return WebResponse(code=500, message="遇到问题").to_dict()
+        logger.exception(f"Failed to get node info for {item_id}")
+        return WebResponse.err_dict(500, "遇到问题")
 
 
 # Define the data model for the LLM call request
 @router.get("/view")
 async def get_task_info(item_id: str):
-    db_factory = DBFactory()
-    if Config.get_es_config():
-        jes_config = Config.get_es_config()
-        hosts = jes_config["hosts"]
-        user = jes_config["user"]
-        password = jes_config["password"]
-        es_client = db_factory.get_instance(JesEs, hosts, user, password)
-    else:
-        es_client = db_factory.get_instance(LocalEs)
-
-    # es_client.exists(Config.get_app_name() + "_node", doc_id=item_id)
-
-    # If item_id is node_id
-    es_response = await es_client.search(
-        Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
+    es_client = get_es_client()
+
+    index_name = _get_node_index_name()
+    trace_query = {
+        # Skip the bulky per-node payloads the trace view never reads
+        "_source": {"excludes": ["input", "shared_data", "extra"]},
+        "sort": [{"create_time": {"order": "asc"}}, {"node_id": {"order": "asc"}}],
+        "track_total_hits": False,
+    }
+    # Look item_id up as a node_id and as a trace_id in a single round trip
+    responses = await es_client.msearch(
+        index_name,
+        [
+            {
+                "query": {"term": {"_id": item_id}},
+                "_source": ["trace_id"],
+                "track_total_hits": False,
+            },
+            {
+                "query": {"term": {"trace_id": item_id}},
+                **trace_query,
+                "size": _TRACE_PAGE_SIZE,
+            },
+        ],
+        preference=_search_preference(item_id),
     )
-    datas = es_response["hits"]["hits"]
+    if responses is None:
+        logger.error(f"ES msearch failed while getting the trace view for {item_id}")
+        return WebResponse.err_dict(500, "遇到问题")
+    node_response, es_response = responses
+    datas = node_response["hits"]["hits"]
     if datas:
+        # If item_id is node_id
         node_data = datas[0]["_source"]
         trace_id = node_data["trace_id"]
+        es_response = None
     else:
         # Input item_id as trace_id
         trace_id = item_id
 
-    es_response = await es_client.search(
-        Config.get_app_name() + "_node",
-        {
-            "query": {"term": {"trace_id": trace_id}},
-            "size": 10000,
-            "sort": [{"create_time": {"order": "asc"}}],
-        },
-    )
     nodes = []
-    for data in es_response["hits"]["hits"]:
-        data["_source"]["call_stack"] = data["_source"]["call_stack"]
-        data["_source"]["node_id_stack"] = data["_source"]["node_id_stack"]
-        data["_source"]["pre_node_ids"] = data["_source"]["pre_node_ids"]
-        if (
-            len(data["_source"]["pre_node_ids"]) == 1
-            and data["_source"]["pre_node_ids"][0] == ""
-        ):
-            data["_source"]["pre_node_ids"] = []
-        nodes.append(data["_source"])
-    for index, node in enumerate(nodes):
-        node["index"] = index
+    async for hits in _iter_search_pages(
+        es_client,
+        index_name,
+        {"query": {"term": {"trace_id": trace_id}}, **trace_query},
+        first_response=es_response,
+        preference=_search_preference(trace_id),
+    ):
+        for data in hits:
+            node = data["_source"]
+            pre_node_ids = node["pre_node_ids"]
+            if len(pre_node_ids) == 1 and pre_node_ids[0] == "":
+                node["pre_node_ids"] = []
+            node["index"] = len(nodes)
+            nodes.append(node)
     add_post_and_child_node_ids(nodes)
     task_data = {"nodes": nodes, "trace_id": trace_id}
-    return WebResponse(data=task_data).to_dict()
+    # The nodes are plain decoded JSON, so hand them straight to orjson instead
+    # of letting FastAPI walk the whole trace with jsonable_encoder first
+    return ORJSONResponse(WebResponse.ok_dict(task_data))
 
 
 class Item(BaseModel):
@@ -262,58 +434,44 @@ async def call(item: Item):
         dict: ``WebResponse`` wrapper containing the model output.
     """
     try:
-        # Preprocess environment variable substitutions
-        pattern = r"^\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}$"
-        for tree in [
-            item.class_attr,
-            item.class_attr.get("llm_params", dict()),
-            item.arguments,
-        ]:
-            for k, v in tree.items():
-                if not isinstance(v, str):
-                    continue
-                match = re.match(pattern, v.strip())
-                if match:
-                    tree[k] = os.getenv(match.group(1), v)
-
         # Validate required field exists
         if "class_name" not in item.class_attr:
-            return WebResponse(
-                code=400, message="Missing required field: class_name"
-            ).to_dict()
+            return WebResponse.err_dict(400, "Missing required field: class_name")
+
+        # Preprocess environment variable substitutions, converting the types
+        # of LLM parameters in the same pass
+        llm_params = item.class_attr.get("llm_params", dict())
+        for tree in [item.class_attr, llm_params, item.arguments]:
+            is_llm_params = tree is llm_params
+            for k, v in tree.items():
+                if isinstance(v, str):
+                    match = _ENV_VAR_RE.match(v.strip())
+                    if match:
+                        v = tree[k] = os.getenv(match.group(1), v)
+                if is_llm_params and k in _LLM_PARAMS_TYPES:
+                    try:
+                        tree[k] = _LLM_PARAMS_TYPES[k](v)
+                    except (ValueError, TypeError) as e:
+                        return WebResponse.err_dict(
+                            400, f"Invalid parameter {k}: {str(e)}"
+                        )
 
         # Set required name field
         item.class_attr["name"] = item.class_attr["class_name"].lower()
 
-        # Type conversion for LLM parameters
-        llm_params_type_dict = {
-            "temperature": float,
-            "max_tokens": int,
-            "top_p": float,
-        }
-        for k, v in item.class_attr.get("llm_params", dict()).items():
-            if k in llm_params_type_dict:
-                try:
-                    item.class_attr["llm_params"][k] = llm_params_type_dict[k](v)
-                except (ValueError, TypeError) as e:
-                    return WebResponse(
-                        code=400, message=f"Invalid parameter {k}: {str(e)}"
-                    ).to_dict()
-
         # Create Oxy instance with security checks and execute
         oxy = OxyFactory.create_oxy(item.class_attr["class_name"], **item.class_attr)
         oxy_response = await oxy.execute(OxyRequest(arguments=item.arguments))
-        return WebResponse(data={"output": oxy_response.output}).to_dict()
+        return WebResponse.ok_dict({"output": oxy_response.output})
     except SecurityError as e:
         logger.warning(
             f"Security check failed: {str(e)}",
             extra={"class_name": item.class_attr.get("class_name", "unknown")},
         )
-        return WebResponse(code=403, message=f"Security error: {str(e)}").to_dict()
+        return WebResponse.err_dict(403, f"Security error: {str(e)}")
     except Exception:
-        error_msg = traceback.format_exc()
-        logger.error(f"Error in /call endpoint: {error_msg}")
-        return WebResponse(code=500, message="Internal server error").to_dict()
+        logger.exception("Error in /call endpoint")
+        return WebResponse.err_dict(500, "Internal server error")
 
 
 class Script(BaseModel):
@@ -333,27 +491,54 @@ class Script(BaseModel):
 # ---------------------------------------------------------------------------
 
 
+# (script_save_dir, directory mtime) -> script names found at that mtime
+_script_list_cache = (None, [])
+
+
+def _list_scripts(script_save_dir: str) -> List[str]:
+    """Return the names of the scripts saved in *script_save_dir*."""
+    global _script_list_cache
+    os.makedirs(script_save_dir, exist_ok=True)
+    # Saving or removing a script bumps the directory mtime, which invalidates
+    # the cached listing
+    cache_key = (script_save_dir, os.stat(script_save_dir).st_mtime_ns)
+    cached_key, scripts = _script_list_cache
+    if cached_key != cache_key:
+        with os.scandir(script_save_dir) as entries:
+            scripts = [
+                entry.name[: -len(".json")]
+                for entry in entries
+                if entry.name.endswith(".json")
+            ]
+        _script_list_cache = (cache_key, scripts)
+    return list(scripts)
+
+
 @router.get("/list_script")
-def list_script():
+async def list_script():
     script_save_dir = os.path.join(Config.get_cache_save_dir(), "script")
-    os.makedirs(script_save_dir, exist_ok=True)
-    files = os.listdir(script_save_dir)
-    if files:
-        return WebResponse(
-            data={
-                "scripts": [
-                    os.path.splitext(file)[0]
-                    for file in files
-                    if file.endswith(".json")
-                ]
-            }
-        ).to_dict()
-    else:
-        return WebResponse(data={"scripts": []}).to_dict()
+    scripts = await asyncio.to_thread(_list_scripts, script_save_dir)
+    return WebResponse.ok_dict({"scripts": scripts})
+
+
+def _write_script(path: str, content: bytes):
+    """Atomically replace the script file at *path* with *content*."""
+    # A unique temp file per call, so concurrent saves of one script never
+    # share (and clobber or steal) the same staging file
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), suffix=".tmp", delete=False
+    ) as tf:
+        tf.write(content)
+        tmp_path = tf.name
+    try:
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
 
 
 @router.post("/save_script")
-def save_script(script: Script):
+async def save_script(script: Script):
     """Persist a script definition to ``$CACHE_DIR/script``.
 
     Args:
@@ -363,24 +548,13 @@ def save_script(script: Script):
         dict: ``WebResponse`` with the generated ``script_id`` timestamp.
     """
     script_save_dir = os.path.join(Config.get_cache_save_dir(), "script")
-    with open(os.path.join(script_save_dir, script.name + ".json"), "w") as f:
-        f.write(json.dumps(script.contents, ensure_ascii=False))
-    return WebResponse(data={"script_id": script.name + ".json"}).to_dict()
+    json_path = os.path.join(script_save_dir, script.name + ".json")
+    await asyncio.to_thread(_write_script, json_path, orjson.dumps(script.contents))
+    return WebResponse.ok_dict({"script_id": script.name + ".json"})
 
 
 @router.get("/load_script")
-def load_script(item_id: str):
-    """Load a previously saved script.
-
-    Args:
-        script_id: Timestamp‑based identifier returned by :func:`save_script`.
-
-    Returns:
-        dict: ``WebResponse`` containing the original ``contents`` array or an
-        error message when the file is missing.
-    """
-@router.get("/load_script")
-def load_script(item_id: str):
+async def load_script(item_id: str):
     """Load a previously saved script.
 
     Args:
@@ -393,10 +567,11 @@ def load_script(item_id: str):
     script_save_dir = os.path.join(Config.get_cache_save_dir(), "script")
 
     json_path = os.path.join(script_save_dir, item_id + ".json")
-    if not os.path.exists(json_path):
-        return WebResponse(code=500, message="File not exist").to_dict()
-    with open(json_path, "r") as f:
-        return WebResponse(data={"contents": json.loads(f.read())}).to_dict()
+    try:
+        content = await asyncio.to_thread(Path(json_path).read_bytes)
+    except FileNotFoundError:
+        return WebResponse.err_dict(500, "File not exist")
+    return WebResponse.ok_dict({"contents": orjson.loads(content)})
 
 
 # =============================================================================
@@ -506,9 +681,8 @@ async def create_prompt(request: PromptCreateRequest):
         from .live_prompt import get_prompt_manager
         manager = await get_prompt_manager()
 
-        # Check if already exists (use cache for consistency)
-        existing = await manager.get_prompt(request.prompt_key, use_cache=True)
-        if existing:
+        # Check if already exists (cache first, id-only lookup on a miss)
+        if await manager.exists_prompt(request.prompt_key):
             raise HTTPException(status_code=400, detail="Prompt already exists")
 
         success = await manager.save_prompt(
@@ -822,15 +996,8 @@ async def get_prompt_version(prompt_key: str, version: int):
         from .live_prompt import get_prompt_manager
         manager = await get_prompt_manager()
 
-        # Get version history
-        history = await manager.get_prompt_history(prompt_key)
-
-        # Find the specific version
-        target_version = None
-        for hist in history:
-            if hist.get("version") == version:
-                target_version = hist
-                break
+        # Look the version up directly instead of scanning the whole history
+        target_version = await manager.get_prompt_version(prompt_key, version)
 
         if not target_version:
             raise HTTPException(status_code=404, detail=f"Version {version} not found for prompt {prompt_key}")
@@ -854,40 +1021,51 @@ async def get_prompt_version(prompt_key: str, version: int):
 # Global MAS instance reference
 _global_mas_instance = None
 
+# Agent listing served by /get_agents, built from the MAS registry on first use
+_agent_list_cache = None
+
 def set_global_mas_instance(mas_instance):
     """Set global MAS instance for API access"""
     global _global_mas_instance
     _global_mas_instance = mas_instance
+    invalidate_agent_cache()
+
+def invalidate_agent_cache():
+    """Drop the cached agent listing after the MAS registry changes"""
+    global _agent_list_cache
+    _agent_list_cache = None
 
 @router.get("/get_agents")
 async def get_agents():
     """Get agents information from MAS instance"""
     try:
-        global _global_mas_instance
+        global _global_mas_instance, _agent_list_cache
         if _global_mas_instance is None:
-            return WebResponse(code=400, message="MAS instance not available").to_dict()
-
-        # Extract agent information from MAS
-        agents = []
-
-        # Get agents from oxy_name_to_oxy registry
-        for agent_name, oxy_instance in _global_mas_instance.oxy_name_to_oxy.items():
-            if hasattr(oxy_instance, '__class__') and hasattr(oxy_instance, 'desc'):
-                agent_info = {
-                    "name": agent_name,
-                    "desc": getattr(oxy_instance, 'desc', ''),
-                    "type": "agent",
-                    "class_name": oxy_instance.__class__.__name__,
-                    "path": [agent_name]
-                }
-                agents.append(agent_info)
-
-        return WebResponse(
-            code=200,
-            message="Successfully retrieved agents",
-            data={"agents": agents}
-        ).to_dict()
+            return WebResponse.err_dict(400, "MAS instance not available")
+
+        if _agent_list_cache is None:
+            # Extract agent information from MAS
+            agents = []
+
+            # Get agents from oxy_name_to_oxy registry
+            for agent_name, oxy_instance in _global_mas_instance.oxy_name_to_oxy.items():
+                if hasattr(oxy_instance, 'desc'):
+                    agent_info = {
+                        "name": agent_name,
+                        "desc": oxy_instance.desc,
+                        "type": "agent",
+                        "class_name": oxy_instance.__class__.__name__,
+                        "path": [agent_name]
+                    }
+                    agents.append(agent_info)
+            _agent_list_cache = agents
+
+        return {
+            "code": 200,
+            "message": "Successfully retrieved agents",
+            "data": {"agents": _agent_list_cache},
+        }
 
     except Exception as e:
         logger.error(f"Failed to get agents: {e}")
-        return WebResponse(code=500, message=f"Failed to get agents: {str(e)}").to_dict()
+        return WebResponse.err_dict(500, f"Failed to get agents: {str(e)}")
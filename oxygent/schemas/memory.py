@@ -5,7 +5,7 @@ Message and Memory Schemas
 
 from typing import Any, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class Function(BaseModel):
@@ -23,6 +23,10 @@ class ToolCall(BaseModel):
     function: Function
 
 
+# Dumps a whole tool call list in one pydantic-core call
+_tool_calls_adapter = TypeAdapter(List[ToolCall])
+
+
 # --------------------------------------------------------------------
 # Chat message wrapper
 # --------------------------------------------------------------------
@@ -67,9 +71,7 @@ class Message(BaseModel):
         if self.content is not None:
             message["content"] = self.content
         if self.tool_calls is not None:
-            message["tool_calls"] = [
-                tool_call.model_dump() for tool_call in self.tool_calls
-            ]
+            message["tool_calls"] = _tool_calls_adapter.dump_python(self.tool_calls)
         if self.name is not None:
             message["name"] = self.name
         if self.tool_call_id is not None:
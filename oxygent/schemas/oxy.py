@@ -13,7 +13,6 @@ import asyncio
 import copy
 import logging
 import os
-import traceback
 from enum import Enum, auto
 from functools import partial
 from typing import Any, List, Optional, Union
@@ -205,9 +204,9 @@ class OxyRequest(BaseModel):
                 if attempt < oxy.retries:
                     await asyncio.sleep(oxy.delay)
                 else:
-                    error_msg = traceback.format_exc()
                     logger.warning(
-                        f"Max retries reached. Failing. {error_msg}",
+                        "Max retries reached. Failing.",
+                        exc_info=True,
                         extra={
                             "trace_id": oxy_request.current_trace_id,
                             "node_id": oxy_request.node_id,
@@ -345,9 +344,8 @@ class OxyRequest(BaseModel):
             )
             raise
         except Exception as e:
-            error_msg = traceback.format_exc()
-            logger.error(
-                f"Error executing oxy {oxy.name}: {error_msg}",
+            logger.exception(
+                f"Error executing oxy {oxy.name}",
                 extra={
                     "trace_id": oxy_request.current_trace_id,
                     "node_id": oxy_request.node_id,
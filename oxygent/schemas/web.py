@@ -10,3 +10,15 @@ class WebResponse(BaseModel):
 
     def to_dict(self):
         return self.model_dump()
+
+    @classmethod
+    def ok_dict(cls, data: dict = None) -> dict:
+        """Build a success payload, equal to ``to_dict()``, without a model."""
+        if data is None:
+            data = {}
+        return {"code": 200, "message": "SUCCESS", "data": data}
+
+    @classmethod
+    def err_dict(cls, code: int, message: str) -> dict:
+        """Build an error payload, equal to ``to_dict()``, without a model."""
+        return {"code": code, "message": message, "data": {}}
@@ -9,6 +9,7 @@ import mimetypes
 import os
 import platform
 import re
+import secrets
 import uuid
 from datetime import datetime
 from io import BytesIO
@@ -17,7 +18,6 @@ from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import aiofiles
 import httpx
-import shortuuid
 from PIL import Image
 from pydantic import AnyUrl
 
@@ -286,8 +286,23 @@ def to_json(obj):
     return json.dumps(obj, ensure_ascii=False, default=str)
 
 
+# shortuuid's default alphabet: no 0/1/I/O/l, 57 symbols
+_UUID_ALPHABET = "23456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# Largest multiple of the alphabet size below 256, so byte % size is unbiased
+_UUID_BYTE_LIMIT = 256 - 256 % len(_UUID_ALPHABET)
+
+
 def generate_uuid(length=16):
-    return shortuuid.ShortUUID().random(length=length)
+    # One urandom read with rejection sampling instead of a secrets.choice
+    # call (and its syscall) per character
+    chars = []
+    while len(chars) < length:
+        chars.extend(
+            _UUID_ALPHABET[b % len(_UUID_ALPHABET)]
+            for b in secrets.token_bytes(length)
+            if b < _UUID_BYTE_LIMIT
+        )
+    return "".join(chars[:length])
 
 
 def is_image(source):
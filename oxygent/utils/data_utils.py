@@ -1,4 +1,9 @@
 from collections import defaultdict
+from operator import itemgetter
+
+# Sort keys used when ordering the children of a tree node
+_ORDER_KEY = itemgetter("order")
+_FIRST_KEY = itemgetter(0)
 
 
 def add_post_and_child_node_ids(nodes):
@@ -91,7 +96,7 @@ def _group_children(children):
 def _process_parallel_groups(parallel_groups):
     parallel_list = []
     for group in parallel_groups.values():
-        group_sorted = sorted(group, key=lambda x: x["order"])
+        group_sorted = sorted(group, key=_ORDER_KEY)
         min_order = group_sorted[0]["order"]
         parallel_list.append((min_order, group_sorted))
     return parallel_list
@@ -99,5 +104,5 @@ def _process_parallel_groups(parallel_groups):
 
 def _merge_and_sort_children(non_parallel, parallel_list):
     all_children = [(child["order"], child) for child in non_parallel] + parallel_list
-    all_children.sort(key=lambda x: x[0])
+    all_children.sort(key=_FIRST_KEY)
     return all_children
@@ -38,6 +38,13 @@ def test_filter_json_types_and_msgpack():
     assert cu.msgpack_preprocess({"t": (1, 2)}) == {"t": [1, 2]}
 
 
+def test_generate_uuid():
+    ids = {cu.generate_uuid() for _ in range(200)}
+    assert len(ids) == 200
+    assert all(len(i) == 16 and set(i) <= set(cu._UUID_ALPHABET) for i in ids)
+    assert len(cu.generate_uuid(32)) == 32
+
+
 def test_get_md5_and_to_json():
     s = "abc"
     assert cu.get_md5(s) == hashlib.md5(b"abc").hexdigest()
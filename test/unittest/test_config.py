@@ -0,0 +1,22 @@
+"""
+Unit tests for oxygent.config
+"""
+
+import pytest
+
+from oxygent.config import Config
+
+
+@pytest.mark.parametrize("bad_size", [0, -1, True, "1024", None])
+def test_upload_buffer_size_falls_back_on_invalid_config(monkeypatch, bad_size):
+    monkeypatch.setitem(Config._config["server"], "upload_buffer_size", bad_size)
+    assert Config.get_server_upload_buffer_size() == 1048576
+
+
+def test_upload_buffer_size_setter(monkeypatch):
+    monkeypatch.setitem(Config._config["server"], "upload_buffer_size", 1048576)
+    Config.set_server_upload_buffer_size(4096)
+    assert Config.get_server_upload_buffer_size() == 4096
+    with pytest.raises(ValueError):
+        Config.set_server_upload_buffer_size(0)
+    assert Config.get_server_upload_buffer_size() == 4096
@@ -5,12 +5,13 @@ Unit tests for document_tools module
 """
 
 import asyncio
-import json
 import os
 import tempfile
 import unittest
 from pathlib import Path
 
+import orjson
+
 # 尝试导入依赖库，如果没有则跳过测试
 try:
     import fitz  # PyMuPDF
@@ -45,25 +46,23 @@ class TestDocumentTools(unittest.TestCase):
     """文档处理工具测试类"""
 
     # ==================== 工具运行适配器 ====================
-    @staticmethod
-    def _run_tool(func, *args, **kwargs):
+    @classmethod
+    def _run_tool(cls, func, *args, **kwargs):
         """
         适配工具函数同步/异步两种实现：
-        - 如果被 @FunctionHub.tool 装饰，函数会被替换为 async，需要 await
+        - 如果被 @FunctionHub.tool 装饰，函数会被替换为 async，在类共享的事件循环中执行
         - 如果是普通函数，直接返回结果
         """
-        try:
-            result = func(*args, **kwargs)
-            if asyncio.iscoroutine(result):
-                return asyncio.run(result)
-            return result
-        except TypeError:
-            # 某些实现可能返回协程函数对象
-            return asyncio.run(func(*args, **kwargs))
+        result = func(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            return cls._loop.run_until_complete(result)
+        return result
 
     @classmethod
     def setUpClass(cls):
         """创建测试数据目录"""
+        # 整个测试类复用一个事件循环，避免每次调用工具都新建并销毁循环
+        cls._loop = asyncio.new_event_loop()
         cls.test_dir = tempfile.mkdtemp(prefix="doc_tools_test_")
         cls.test_files = {}
 
@@ -87,18 +86,28 @@ class TestDocumentTools(unittest.TestCase):
 
         # 第1页 - 文本内容
         page1 = doc.new_page(width=595, height=842)  # A4尺寸
-        page1.insert_text((50, 50), "Test Document", fontsize=20)
-        page1.insert_text((50, 100), "This is page 1 with some test content.")
-        page1.insert_text((50, 130), "测试中文内容：这是第一页。")
+        cls._write_lines(
+            page1,
+            [
+                ((50, 50), "Test Document", 20),
+                ((50, 100), "This is page 1 with some test content.", 11),
+                ((50, 130), "测试中文内容：这是第一页。", 11),
+            ],
+        )
 
         # 第2页 - 更多文本
         page2 = doc.new_page()
-        page2.insert_text((50, 50), "Page 2", fontsize=20)
-        page2.insert_text((50, 100), "More content on page 2.")
+        cls._write_lines(
+            page2,
+            [
+                ((50, 50), "Page 2", 20),
+                ((50, 100), "More content on page 2.", 11),
+            ],
+        )
 
         # 第3页 - 简单内容
         page3 = doc.new_page()
-        page3.insert_text((50, 50), "Page 3", fontsize=20)
+        cls._write_lines(page3, [((50, 50), "Page 3", 20)])
 
         doc.save(pdf_path)
         doc.close()
@@ -115,6 +124,14 @@ class TestDocumentTools(unittest.TestCase):
 
         cls.test_files["pdf2"] = str(pdf_path2)
 
+    @staticmethod
+    def _write_lines(page, lines):
+        """用一个TextWriter批量写入多行文本，只生成一次内容流"""
+        writer = fitz.TextWriter(page.rect)
+        for pos, text, fontsize in lines:
+            writer.append(pos, text, fontsize=fontsize)
+        writer.write_text(page)
+
     @classmethod
     def _create_test_docx(cls):
         """创建测试用的Word文档"""
@@ -153,11 +170,11 @@ class TestDocumentTools(unittest.TestCase):
     def _create_test_excel(cls):
         """创建测试用的Excel文件"""
         excel_path = Path(cls.test_dir) / "test_document.xlsx"
-        wb = Workbook()
+        # 只写模式直接流式输出XML，不在内存中构建单元格对象
+        wb = Workbook(write_only=True)
 
         # 第一个工作表
-        ws1 = wb.active
-        ws1.title = "Sheet1"
+        ws1 = wb.create_sheet("Sheet1")
         ws1.append(["Name", "Age", "City"])
         ws1.append(["Alice", 30, "Beijing"])
         ws1.append(["Bob", 25, "Shanghai"])
@@ -177,6 +194,9 @@ class TestDocumentTools(unittest.TestCase):
         """清理测试文件"""
         import shutil
 
+        cls._loop.run_until_complete(cls._loop.shutdown_default_executor())
+        cls._loop.close()
+
         if os.path.exists(cls.test_dir):
             shutil.rmtree(cls.test_dir)
 
@@ -188,7 +208,7 @@ class TestDocumentTools(unittest.TestCase):
         from function_hubs.document_tools import extract_pdf_text
 
         result_str = self._run_tool(extract_pdf_text, self.test_files["pdf"])
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["total_pages"], 3)
@@ -204,7 +224,7 @@ class TestDocumentTools(unittest.TestCase):
         result_str = self._run_tool(
             extract_pdf_text, self.test_files["pdf"], page_range="1"
         )
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["extracted_pages"], 1)
@@ -213,22 +233,50 @@ class TestDocumentTools(unittest.TestCase):
         result_str = self._run_tool(
             extract_pdf_text, self.test_files["pdf"], page_range="1-2"
         )
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["extracted_pages"], 2)
 
+    @unittest.skipIf(not PYMUPDF_AVAILABLE, "PyMuPDF not installed")
+    def test_extract_pdf_text_to_file(self):
+        """测试PDF文本逐页写入NDJSON文件"""
+        from function_hubs.document_tools import extract_pdf_text
+
+        output_file = os.path.join(self.test_dir, "pages.ndjson")
+        result_str = self._run_tool(
+            extract_pdf_text, self.test_files["pdf"], output_path=output_file
+        )
+        result = orjson.loads(result_str)
+
+        self.assertTrue(result["success"])
+        self.assertNotIn("pages", result)
+        self.assertEqual(result["output_path"], output_file)
+
+        with open(output_file, "rb") as f:
+            pages = [orjson.loads(line) for line in f]
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[0]["page_number"], 1)
+        self.assertIn("Test Document", pages[0]["text"])
+
     @unittest.skipIf(not PYMUPDF_AVAILABLE, "PyMuPDF not installed")
     def test_get_pdf_info(self):
         """测试获取PDF信息"""
         from function_hubs.document_tools import get_pdf_info
 
         result_str = self._run_tool(get_pdf_info, self.test_files["pdf"])
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["document_properties"]["page_count"], 3)
         self.assertFalse(result["document_properties"]["is_encrypted"])
+
+        # 文件未变化时重复查询命中缓存
+        from function_hubs.document_tools import _pdf_info_json
+
+        hits = _pdf_info_json.cache_info().hits
+        self.assertEqual(self._run_tool(get_pdf_info, self.test_files["pdf"]), result_str)
+        self.assertEqual(_pdf_info_json.cache_info().hits, hits + 1)
         self.assertIn("file_info", result)
         self.assertIn("content_statistics", result)
 
@@ -241,7 +289,7 @@ class TestDocumentTools(unittest.TestCase):
         pdf_list = [self.test_files["pdf"], self.test_files["pdf2"]]
 
         result_str = self._run_tool(merge_pdfs, pdf_list, output_path)
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertTrue(os.path.exists(output_path))
@@ -253,7 +301,7 @@ class TestDocumentTools(unittest.TestCase):
         from function_hubs.document_tools import split_pdf
 
         output_dir = os.path.join(self.test_dir, "split_output")
-        split_ranges = ["1", "2-3"]
+        split_ranges = ["1", "2-3", "1,3"]
 
         result_str = self._run_tool(
             split_pdf,
@@ -261,14 +309,16 @@ class TestDocumentTools(unittest.TestCase):
             split_ranges,
             output_dir,
         )
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
-        self.assertEqual(len(result["files"]), 2)
+        self.assertEqual(len(result["files"]), 3)
 
-        # 验证文件存在
+        # 验证文件存在且页数正确
         for file_info in result["files"]:
             self.assertTrue(os.path.exists(file_info["path"]))
+            with fitz.open(file_info["path"]) as split_doc:
+                self.assertEqual(len(split_doc), file_info["page_count"])
 
     @unittest.skipIf(not PYMUPDF_AVAILABLE, "PyMuPDF not installed")
     def test_extract_pdf_images(self):
@@ -280,7 +330,7 @@ class TestDocumentTools(unittest.TestCase):
         result_str = self._run_tool(
             extract_pdf_images, self.test_files["pdf"], output_dir
         )
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         # 测试PDF没有图像，所以应该为0
@@ -294,7 +344,7 @@ class TestDocumentTools(unittest.TestCase):
         from function_hubs.document_tools import read_docx
 
         result_str = self._run_tool(read_docx, self.test_files["docx"])
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertGreater(result["statistics"]["paragraph_count"], 0)
@@ -310,7 +360,7 @@ class TestDocumentTools(unittest.TestCase):
         from function_hubs.document_tools import extract_docx_text
 
         result_str = self._run_tool(extract_docx_text, self.test_files["docx"])
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertIn("first paragraph", result["text"])
@@ -324,7 +374,7 @@ class TestDocumentTools(unittest.TestCase):
         from function_hubs.document_tools import read_excel
 
         result_str = self._run_tool(read_excel, self.test_files["excel"])
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["statistics"]["row_count"], 3)
@@ -341,7 +391,7 @@ class TestDocumentTools(unittest.TestCase):
         result_str = self._run_tool(
             read_excel, self.test_files["excel"], sheet_name="Sheet2"
         )
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["sheet_name"], "Sheet2")
@@ -353,7 +403,7 @@ class TestDocumentTools(unittest.TestCase):
         from function_hubs.document_tools import list_excel_sheets
 
         result_str = self._run_tool(list_excel_sheets, self.test_files["excel"])
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         self.assertTrue(result["success"])
         self.assertEqual(result["sheet_count"], 2)
@@ -370,7 +420,7 @@ class TestDocumentTools(unittest.TestCase):
 
         if "pdf" in self.test_files:
             result_str = self._run_tool(detect_document_format, self.test_files["pdf"])
-            result = json.loads(result_str)
+            result = orjson.loads(result_str)
 
             self.assertTrue(result["success"])
             self.assertEqual(result["format_info"]["type"], "PDF")
@@ -400,6 +450,10 @@ class TestDocumentTools(unittest.TestCase):
         pages = _parse_page_range("1-3,5,7-9", 10)
         self.assertEqual(pages, [0, 1, 2, 4, 6, 7, 8])
 
+        # 测试超出文档范围的区间被裁剪
+        pages = _parse_page_range("8-1000000,0-2", 10)
+        self.assertEqual(pages, [0, 1, 7, 8, 9])
+
     # ==================== 错误处理测试 ====================
 
     def test_file_not_exist_error(self):
@@ -408,20 +462,25 @@ class TestDocumentTools(unittest.TestCase):
 
         non_exist_file = "/tmp/non_exist_file.pdf"
 
+        tools = []
         # PDF
         if PYMUPDF_AVAILABLE:
-            result = json.loads(self._run_tool(extract_pdf_text, non_exist_file))
-            self.assertIn("error", result)
-
+            tools.append(extract_pdf_text)
         # Word
         if DOCX_AVAILABLE:
-            result = json.loads(self._run_tool(read_docx, non_exist_file))
-            self.assertIn("error", result)
-
+            tools.append(read_docx)
         # Excel
         if OPENPYXL_AVAILABLE:
-            result = json.loads(self._run_tool(read_excel, non_exist_file))
-            self.assertIn("error", result)
+            tools.append(read_excel)
+
+        # 三个工具互不依赖，在共享事件循环中并发执行
+        async def run_all():
+            return await asyncio.gather(*(tool(non_exist_file) for tool in tools))
+
+        results = self._loop.run_until_complete(run_all())
+        # 错误响应以error为首个键，直接检查前缀，无需解析整个JSON
+        for result_str in results:
+            self.assertTrue(result_str.startswith('{"error":'), result_str)
 
     @unittest.skipIf(not PYMUPDF_AVAILABLE, "PyMuPDF not installed")
     def test_invalid_page_range(self):
@@ -432,7 +491,7 @@ class TestDocumentTools(unittest.TestCase):
         result_str = self._run_tool(
             extract_pdf_text, self.test_files["pdf"], page_range="100-200"
         )
-        result = json.loads(result_str)
+        result = orjson.loads(result_str)
 
         # 应该返回错误或空结果
         self.assertTrue("error" in result or result["extracted_pages"] == 0)
@@ -6,7 +6,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from oxygent.databases.db_es.jes_es import JesEs
+from oxygent.databases.db_es.jes_es import JesEs, OrjsonSerializer
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -80,6 +80,46 @@ async def test_search_doc(jes_es, mock_client):
     mock_client.search.assert_called_once_with(index="idx", body=query)
 
 
+@pytest.mark.asyncio
+async def test_msearch_docs(jes_es, mock_client):
+    mock_client.msearch.return_value = {
+        "responses": [{"hits": {"hits": []}}, {"hits": {"hits": [{"_id": "1"}]}}]
+    }
+    queries = [{"query": {"term": {"_id": "1"}}}, {"query": {"match_all": {}}}]
+    res = await jes_es.msearch("idx", queries)
+    assert len(res) == 2
+    assert res[1]["hits"]["hits"][0]["_id"] == "1"
+    mock_client.msearch.assert_called_once_with(
+        index="idx", body=[{}, queries[0], {}, queries[1]]
+    )
+
+
+@pytest.mark.asyncio
+async def test_msearch_item_error(jes_es, mock_client):
+    mock_client.msearch.return_value = {
+        "responses": [
+            {"hits": {"hits": []}},
+            {"error": {"type": "index_not_found_exception"}, "status": 404},
+        ]
+    }
+    queries = [{"query": {"match_all": {}}}, {"query": {"match_all": {}}}]
+    assert await jes_es.msearch("idx", queries) is None
+
+
+@pytest.mark.asyncio
+async def test_search_preference(jes_es, mock_client):
+    mock_client.msearch.return_value = {"responses": [{"hits": {"hits": []}}]}
+    query = {"query": {"term": {"trace_id": "t1"}}}
+    await jes_es.search("idx", query, preference="t1")
+    mock_client.search.assert_called_once_with(
+        index="idx", body=query, preference="t1"
+    )
+    await jes_es.msearch("idx", [query], preference="t1")
+    mock_client.msearch.assert_called_once_with(
+        index="idx", body=[{"preference": "t1"}, query]
+    )
+
+
 @pytest.mark.asyncio
 async def test_exists_doc(jes_es, mock_client):
     res = await jes_es.exists("idx", "1")
@@ -92,3 +132,16 @@ async def test_close_client(jes_es, mock_client):
     res = await jes_es.close()
     assert res is None
     mock_client.close.assert_called_once()
+
+
+def test_orjson_serializer_roundtrip():
+    serializer = OrjsonSerializer()
+    body = {"query": {"term": {"trace_id": "中"}}, 1: 2}
+    assert serializer.dumps(body) == '{"query":{"term":{"trace_id":"中"}},"1":2}'
+    assert serializer.loads(serializer.dumps(body)) == {
+        "query": {"term": {"trace_id": "中"}},
+        "1": 2,
+    }
+    # strings are passed through, oversized ints fall back to stdlib json
+    assert serializer.dumps("raw") == "raw"
+    assert serializer.dumps({"n": 2**70}) == '{"n":%d}' % 2**70
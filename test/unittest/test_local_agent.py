@@ -23,6 +23,11 @@ class DummyMAS:
         self.es_client = AsyncMock()
         self.vearch_client = AsyncMock()
         self.background_tasks = set()
+        self.registered = []
+
+    def register_oxy(self, name, oxy):
+        self.oxy_name_to_oxy[name] = oxy
+        self.registered.append(name)
 
     @staticmethod
     def is_agent(name: str) -> bool:
@@ -136,6 +141,14 @@ async def test_initialization(dummy_local_agent):
     assert dummy_local_agent.is_multimodal_supported is False
 
 
+@pytest.mark.asyncio
+async def test_team_init_registers_through_mas(dummy_local_agent, mas_env):
+    dummy_local_agent.team_size = 2
+    await dummy_local_agent.init()
+    assert mas_env.registered == ["agent_tester_1", "agent_tester_2", "agent_tester"]
+    assert mas_env.oxy_name_to_oxy["agent_tester"] is not dummy_local_agent
+
+
 @pytest.mark.asyncio
 async def test_full_execute_cycle(dummy_local_agent, oxy_request):
     resp = await dummy_local_agent.execute(copy.deepcopy(oxy_request))
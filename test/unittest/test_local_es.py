@@ -85,6 +85,56 @@ async def test_search_term_terms_bool_sort(local_es):
     hits = res4["hits"]["hits"]
     assert hits[0]["_source"]["n"] == 3
 
+    # bool.filter query
+    q5 = {"query": {"bool": {"filter": [{"term": {"k": "v2"}}, {"term": {"n": 1}}]}}}
+    res5 = await local_es.search("idx", q5)
+    assert [hit["_id"] for hit in res5["hits"]["hits"]] == ["b"]
+
+    # term/terms match any element of an array field
+    await local_es.index("idx", "d", {"k": "v3", "n": 0, "tags": ["x", "y"]})
+    q6 = {"query": {"bool": {"filter": [{"term": {"tags": "y"}}]}}}
+    res6 = await local_es.search("idx", q6)
+    assert [hit["_id"] for hit in res6["hits"]["hits"]] == ["d"]
+    q7 = {"query": {"terms": {"tags": ["z", "x"]}}}
+    res7 = await local_es.search("idx", q7)
+    assert [hit["_id"] for hit in res7["hits"]["hits"]] == ["d"]
+
+
+@pytest.mark.asyncio
+async def test_msearch(local_es):
+    await local_es.create_index("idx", {"mappings": {}})
+    await local_es.index("idx", "a", {"k": "v1", "n": 2})
+    await local_es.index("idx", "b", {"k": "v2", "n": 1})
+
+    res = await local_es.msearch(
+        "idx",
+        [
+            {"query": {"term": {"_id": "b"}}},
+            {"query": {"term": {"k": "v3"}}},
+            {"sort": [{"n": {"order": "asc"}}]},
+        ],
+    )
+    assert len(res) == 3
+    assert res[0]["hits"]["hits"][0]["_source"]["k"] == "v2"
+    assert res[1]["hits"]["hits"] == []
+    assert [hit["_id"] for hit in res[2]["hits"]["hits"]] == ["b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_search_after(local_es):
+    await local_es.create_index("idx", {"mappings": {}})
+    for doc_id, n in [("a", 2), ("b", 1), ("c", 3)]:
+        await local_es.index("idx", doc_id, {"id": doc_id, "n": n})
+
+    body = {"sort": [{"n": {"order": "asc"}}, {"id": {"order": "asc"}}], "size": 2}
+    page1 = (await local_es.search("idx", body))["hits"]["hits"]
+    assert [hit["_id"] for hit in page1] == ["b", "a"]
+    assert page1[-1]["sort"] == [2, "a"]
+
+    body["search_after"] = page1[-1]["sort"]
+    page2 = (await local_es.search("idx", body))["hits"]["hits"]
+    assert [hit["_id"] for hit in page2] == ["c"]
+
 
 @pytest.mark.asyncio
 async def test_close(local_es):